@@ -1,15 +1,17 @@
 import os
 import jwt
-from jwt import PyJWKClient
+from .jwks_cache import JwksCache
 
-APPLE_JWKS_URL = "https://appleid.apple.com/auth/keys"
+APPLE_JWKS_URL = os.environ.get("APPLE_JWKS_URL", "https://appleid.apple.com/auth/keys")
 APPLE_ISSUER  = "https://appleid.apple.com"
 
 APPLE_BUNDLE_ID = os.environ.get("APPLE_BUNDLE_ID", "com.VladKarpov.PlateSpotter")
 
-def verify_apple_identity_token(identity_token: str) -> dict:
-    jwk_client = PyJWKClient(APPLE_JWKS_URL)
-    signing_key = jwk_client.get_signing_key_from_jwt(identity_token)
+apple_jwks = JwksCache(APPLE_JWKS_URL)
+
+def verify_apple_identity_token(identity_token: str, jwks: JwksCache = None) -> dict:
+    kid = jwt.get_unverified_header(identity_token).get("kid")
+    signing_key = (jwks or apple_jwks).get_signing_key(kid)
 
     payload = jwt.decode(
         identity_token,
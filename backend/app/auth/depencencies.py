@@ -1,25 +1,59 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.db.models import User
 from .service import SECRET_KEY, ALGORITHM
+from .principal_cache import Principal, principal_cache
+from .guest import is_guest_subject
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+@dataclass(frozen=True)
+class Claims:
+    id: Optional[int]
+    auth_provider: str
+
+def decode_token(token: str):
     if not token:
         raise HTTPException(status_code=401, detail="Токен відсутній")
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
+        subject = payload.get("sub")
+        if subject is None:
             raise HTTPException(status_code=401, detail="Недійсний токен")
-    except JWTError:
+        return (subject if is_guest_subject(subject) else int(subject)), payload
+    except (JWTError, ValueError):
         raise HTTPException(status_code=401, detail="Недійсний токен")
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Користувача не знайдено")
-    return user
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    subject, payload = decode_token(token)
+    principal = principal_cache.get(subject, token)
+    if principal is not None:
+        return principal
+
+    if is_guest_subject(subject):
+        user = await db.scalar(select(User).where(User.guest_id == subject))
+        principal = Principal.from_user(user) if user else Principal.guest(subject)
+    else:
+        user = await db.scalar(select(User).where(User.id == subject))
+        if not user:
+            raise HTTPException(status_code=401, detail="Користувача не знайдено")
+        principal = Principal.from_user(user)
+    expires_in = payload["exp"] - time.time() if "exp" in payload else None
+    principal_cache.put(subject, token, principal, expires_in)
+    return principal
+
+async def get_current_claims(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    # Лише id і провайдер з підписаного токена, без звернення до бази.
+    # Токени, видані до появи claim "provider", проходять звичайну перевірку
+    subject, payload = decode_token(token)
+    provider = payload.get("provider")
+    if provider is None:
+        return await get_current_user(token, db)
+    return Claims(id=None if is_guest_subject(subject) else subject, auth_provider=provider)
@@ -0,0 +1,27 @@
+import uuid
+from sqlalchemy.exc import IntegrityError
+from app.db.models import User
+
+# Гість існує лише в підписаному токені; рядок у users з'являється, коли є що зберегти
+GUEST_SUBJECT_PREFIX = "guest:"
+
+def new_guest_subject():
+    return GUEST_SUBJECT_PREFIX + uuid.uuid4().hex
+
+def is_guest_subject(subject):
+    return isinstance(subject, str) and subject.startswith(GUEST_SUBJECT_PREFIX)
+
+def get_or_create_guest_user(db, guest_id):
+    user = db.query(User).filter(User.guest_id == guest_id).first()
+    if user:
+        return user
+    user = User(email=None, hashed_password=None, auth_provider="guest", guest_id=guest_id)
+    db.add(user)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Паралельний запит того ж гостя встиг створити рядок першим
+        db.rollback()
+        return db.query(User).filter(User.guest_id == guest_id).one()
+    db.refresh(user)
+    return user
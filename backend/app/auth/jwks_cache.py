@@ -0,0 +1,128 @@
+import logging
+import os
+import re
+import threading
+import time
+import requests
+from jwt import PyJWK
+from jwt.exceptions import PyJWKError
+
+logger = logging.getLogger(__name__)
+
+JWKS_CACHE_TTL = float(os.getenv("JWKS_CACHE_TTL", "3600"))
+JWKS_FETCH_TIMEOUT = float(os.getenv("JWKS_FETCH_TIMEOUT", "5"))
+# Невідомий kid не повинен дозволяти будь-кому змушувати нас ходити до Apple щосекунди
+JWKS_MIN_REFETCH_INTERVAL = float(os.getenv("JWKS_MIN_REFETCH_INTERVAL", "30"))
+JWKS_RETRY_INTERVAL = float(os.getenv("JWKS_RETRY_INTERVAL", "30"))
+REFRESH_AHEAD = 0.8
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class JwksUnavailable(Exception):
+    pass
+
+
+class JwksCache:
+    def __init__(self, url, ttl=JWKS_CACHE_TTL, timeout=JWKS_FETCH_TIMEOUT,
+                 min_refetch_interval=JWKS_MIN_REFETCH_INTERVAL, retry_interval=JWKS_RETRY_INTERVAL,
+                 session=None):
+        self.url = url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.min_refetch_interval = min_refetch_interval
+        self.retry_interval = retry_interval
+        self.session = session or requests.Session()
+        self._keys = {}
+        self._fetched_at = None
+        self._attempted_at = None
+        self._missed_at = None
+        self._expires_at = 0.0
+        self._fetch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher = None
+        self.fetches = 0
+        self.failures = 0
+
+    def get_signing_key(self, kid):
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        # Ротація ключів у Apple: один повторний запит на всіх, хто чекає цей kid
+        self._refresh(kid, started=time.monotonic())
+        key = self._keys.get(kid)
+        if key is None:
+            if not self._keys:
+                raise JwksUnavailable("Ключі Apple недоступні")
+            raise PyJWKError(f"Невідомий ключ Apple: {kid}")
+        return key
+
+    def _refresh(self, kid, started):
+        with self._fetch_lock:
+            # Поки ми чекали на блокування, інший потік уже сходив по ключі
+            if kid in self._keys or (self._attempted_at is not None and self._attempted_at >= started):
+                return
+            # Без ключів обмежуємо всі спроби (Apple може лежати від старту), з ключами - лише невідомі kid
+            now = time.monotonic()
+            last = self._missed_at if self._keys else self._attempted_at
+            if last is not None and now - last < self.min_refetch_interval:
+                return
+            if self._keys:
+                self._missed_at = now
+            self._fetch()
+
+    def _fetch(self):
+        self.fetches += 1
+        self._attempted_at = time.monotonic()
+        try:
+            response = self.session.get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            keys = {}
+            for data in response.json()["keys"]:
+                try:
+                    keys[data["kid"]] = PyJWK(data)
+                except (KeyError, PyJWKError):
+                    continue
+            if not keys:
+                raise ValueError("порожній набір ключів")
+        except (requests.RequestException, ValueError, KeyError) as e:
+            # Застарілі ключі краще за відмову в авторизації, поки Apple недоступний
+            self.failures += 1
+            logger.warning("Не вдалося оновити ключі Apple: %s", e)
+            return False
+
+        match = _MAX_AGE.search(response.headers.get("Cache-Control", ""))
+        ttl = min(self.ttl, float(match.group(1))) if match else self.ttl
+        now = time.monotonic()
+        self._keys = keys
+        self._fetched_at = now
+        self._expires_at = now + ttl
+        self._ensure_refresher()
+        return True
+
+    def _ensure_refresher(self):
+        if self._refresher is None or not self._refresher.is_alive():
+            self._refresher = threading.Thread(target=self._refresh_loop, name="jwks-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self):
+        while True:
+            fetched_at = self._fetched_at
+            delay = max((self._expires_at - fetched_at) * REFRESH_AHEAD - (time.monotonic() - fetched_at), 0)
+            if self._stop.wait(delay):
+                return
+            with self._fetch_lock:
+                refreshed = self._fetched_at != fetched_at or self._fetch()
+            if not refreshed and self._stop.wait(self.retry_interval):
+                return
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {
+            "keys": sorted(self._keys),
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "age_sec": round(time.monotonic() - self._fetched_at, 1) if self._fetched_at else None,
+        }
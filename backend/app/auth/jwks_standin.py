@@ -0,0 +1,64 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class JwksStandIn:
+    # Локальна заміна appleid.apple.com/auth/keys: ротація ключів, збої та затримки
+    def __init__(self, keys, max_age=None):
+        self.keys = list(keys)
+        self.max_age = max_age
+        self.status = 200
+        self.delay = 0.0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def rotate(self, keys):
+        self.keys = list(keys)
+
+    def fail(self, status=503):
+        self.status = status
+
+    def recover(self):
+        self.status = 200
+
+    def handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                with standin._lock:
+                    standin.requests += 1
+                if standin.delay:
+                    time.sleep(standin.delay)
+                if standin.status != 200:
+                    self.send_response(standin.status)
+                    self.end_headers()
+                    return
+                body = json.dumps({"keys": standin.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if standin.max_age is not None:
+                    self.send_header("Cache-Control", f"max-age={standin.max_age}")
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+@contextmanager
+def serve_jwks(standin, host="127.0.0.1", port=0):
+    server = ThreadingHTTPServer((host, port), standin.handler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_port}/auth/keys"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -13,12 +13,15 @@ class UserMeResponse(BaseModel):
     token_type: str
     expires_in: int
 
-def create_access_token(user_id: str, token_type: str, expires_delta: timedelta = timedelta(hours=1)):
+def create_access_token(user_id: str, token_type: str, expires_delta: timedelta = timedelta(hours=1),
+                        auth_provider: str = None):
     to_encode = {
         "sub": user_id,
         "type": token_type,
         "exp": datetime.utcnow() + expires_delta
     }
+    if auth_provider:
+        to_encode["provider"] = auth_provider
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from .service import hash_password, verify_password, verify_and_update_password
+
+# bcrypt відпускає GIL, тож потоки справді рахують паралельно, не блокуючи event loop.
+# 0 - рахувати прямо в обробнику (лише для порівняння в бенчмарку)
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_QUEUE_LIMIT = int(os.getenv("PASSWORD_QUEUE_LIMIT", str(max(PASSWORD_WORKERS, 1) * 8)))
+PASSWORD_REHASH_ON_LOGIN = os.getenv("PASSWORD_REHASH_ON_LOGIN", "").lower() in ("1", "true", "yes")
+RETRY_AFTER_SECONDS = 1
+
+
+class PasswordPoolBusy(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=503, detail="Сервер перевантажений, спробуйте пізніше",
+                         headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+
+
+class PasswordPool:
+    def __init__(self, workers=PASSWORD_WORKERS, queue_limit=PASSWORD_QUEUE_LIMIT):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="bcrypt") if workers else None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def _run(self, func, *args):
+        if self._executor is None:
+            return func(*args)
+        # Черга обмежена: краще швидко відмовити, ніж тримати запит хвилину в очікуванні
+        with self._lock:
+            if self.in_flight >= self.queue_limit:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    async def hash(self, password):
+        return await self._run(hash_password, password)
+
+    async def verify(self, password, hashed_password):
+        return await self._run(verify_password, password, hashed_password)
+
+    async def verify_and_update(self, password, hashed_password):
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+password_pool = PasswordPool()
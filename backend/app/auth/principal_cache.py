@@ -0,0 +1,107 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    # Незмінний знімок користувача: той самий об'єкт віддається паралельним запитам
+    id: int
+    email: Optional[str]
+    name: Optional[str]
+    bio: Optional[str]
+    auth_provider: Optional[str]
+    guest_id: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(id=user.id, email=user.email, name=user.name, bio=user.bio,
+                   auth_provider=user.auth_provider, guest_id=user.guest_id)
+
+    @classmethod
+    def guest(cls, guest_id):
+        return cls(id=None, email=None, name=None, bio=None, auth_provider="guest", guest_id=guest_id)
+
+    @property
+    def cache_key(self):
+        # Гостьовий токен ідентифікує користувача через guest_id, а не через id рядка
+        return self.guest_id or self.id
+
+
+def token_hash(token):
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class PrincipalCache:
+    def __init__(self, maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._by_user = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id, token):
+        key = (user_id, token_hash(token))
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, token, principal, expires_in=None):
+        # Запис не переживає сам токен
+        ttl = self.ttl if expires_in is None else min(self.ttl, expires_in)
+        if ttl <= 0:
+            return
+        key = (user_id, token_hash(token))
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, principal)
+            self._entries.move_to_end(key)
+            self._by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, user_id):
+        # Лише в цьому процесі; інші воркери побачать зміни не пізніше ніж через TTL
+        with self._lock:
+            for key in self._by_user.pop(user_id, ()):
+                self._entries.pop(key, None)
+            self.invalidations += 1
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        keys = self._by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[key[0]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache()
@@ -1,21 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
 from app.db.models import User
 from app.db.schemas import UserCreate, UserLogin, UserResponse
-from .service import hash_password, verify_password
+from .password_pool import password_pool, PASSWORD_REHASH_ON_LOGIN
 from .oauth import create_access_token
+from .guest import new_guest_subject
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 @router.post("/signup", operation_id="auth_signup", response_model=UserResponse)
-async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     if user_data.auth_provider == "email":
         if not user_data.email or not user_data.password:
             raise HTTPException(status_code=400, detail="Email та пароль обов’язкові")
-        if db.query(User).filter(User.email == user_data.email).first():
+        if await db.scalar(select(User).where(User.email == user_data.email)):
             raise HTTPException(status_code=400, detail="Користувач вже існує")
-        hashed_pw = hash_password(user_data.password)
+        # Завершуємо транзакцію, щоб не тримати з'єднання з пулу, поки рахується bcrypt
+        await db.commit()
+        hashed_pw = await password_pool.hash(user_data.password)
         user = User(email=user_data.email, hashed_password=hashed_pw, auth_provider="email")
     elif user_data.auth_provider == "guest":
         user = User(email=None, hashed_password=None, auth_provider="guest")
@@ -23,29 +28,43 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Невідомий тип авторизації")
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Паралельна реєстрація з тим самим email встигла між перевіркою і вставкою
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Користувач вже існує")
+    await db.refresh(user)
     return user
 
 @router.post("/login", operation_id="auth_login")
-async def login(login_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == login_data.email).first()
-    if not user or not verify_password(login_data.password, user.hashed_password):
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User).where(User.email == login_data.email))
+    if not user or not user.hashed_password:
         raise HTTPException(status_code=401, detail="Невірний email або пароль")
+    await db.commit()
+    if PASSWORD_REHASH_ON_LOGIN:
+        verified, new_hash = await password_pool.verify_and_update(login_data.password, user.hashed_password)
+    else:
+        verified, new_hash = await password_pool.verify(login_data.password, user.hashed_password), None
+    if not verified:
+        raise HTTPException(status_code=401, detail="Невірний email або пароль")
+    if new_hash:
+        # Змінилась вартість bcrypt - оновлюємо хеш, поки маємо відкритий пароль
+        user.hashed_password = new_hash
+        await db.commit()
     token = create_access_token(
         user_id=str(user.id),
-        token_type="access"
+        token_type="access",
+        auth_provider=user.auth_provider
     )
     return {"access_token": token, "token_type": "bearer"}
 
 @router.post("/guest", operation_id="auth_guest_login")
-async def guest_login(db: Session = Depends(get_db)):
-    user = User(email=None, hashed_password=None, auth_provider="guest")
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+async def guest_login():
     token = create_access_token(
-        user_id=str(user.id),
-        token_type="access"
+        user_id=new_guest_subject(),
+        token_type="access",
+        auth_provider="guest"
     )
     return {"access_token": token, "token_type": "bearer"}
@@ -1,23 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.db.database import get_db
 from app.db import models
 from .oauth import create_access_token
-from .apple_auth import verify_apple_identity_token
+from .apple_auth import verify_apple_identity_token, apple_jwks
+from .jwks_cache import JwksUnavailable
+from .principal_cache import principal_cache
 
 router = APIRouter()
 
 class AppleLoginIn(BaseModel):
     identity_token: str
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/auth/apple")
 def apple_login(payload: AppleLoginIn, db: Session = Depends(get_db)):
     try:
@@ -42,9 +37,13 @@ def apple_login(payload: AppleLoginIn, db: Session = Depends(get_db)):
                 user.auth_provider = "apple"
                 db.commit()
                 db.refresh(user)
+                principal_cache.invalidate(user.id)
 
-        access_token = create_access_token(user_id=str(user.id), token_type="apple")
+        access_token = create_access_token(user_id=str(user.id), token_type="apple", auth_provider="apple")
         return {"access_token": access_token, "token_type": "bearer"}
 
+    except JwksUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e),
+                            headers={"Retry-After": str(int(apple_jwks.min_refetch_interval))})
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Apple токен верифікація провалена: {e}")
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from app.db.database import get_db
 from app.db import models
 from .service import hash_password, verify_password
 from .oauth import create_access_token
@@ -16,13 +16,6 @@ class LoginIn(BaseModel):
     email: EmailStr
     password: str
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/auth/register")
 def register(body: RegisterIn, db: Session = Depends(get_db)):
     existing = db.query(models.User).filter(models.User.email == body.email).first()
@@ -38,7 +31,7 @@ def register(body: RegisterIn, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(user)
 
-    token = create_access_token(user_id=str(user.id), token_type="email")
+    token = create_access_token(user_id=str(user.id), token_type="email", auth_provider=user.auth_provider)
     return {"access_token": token, "token_type": "bearer"}
 
 @router.post("/auth/login")
@@ -50,5 +43,5 @@ def login(body: LoginIn, db: Session = Depends(get_db)):
     if not verify_password(body.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Невірні облікові дані")
 
-    token = create_access_token(user_id=str(user.id), token_type="email")
+    token = create_access_token(user_id=str(user.id), token_type="email", auth_provider=user.auth_provider)
     return {"access_token": token, "token_type": "bearer"}
@@ -2,7 +2,9 @@ import os
 from dotenv import load_dotenv
 from passlib.context import CryptContext
 load_dotenv()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Зміна BCRYPT_ROUNDS робить старі хеші "застарілими" для verify_and_update
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
@@ -13,3 +15,7 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    # (чи збігся пароль, новий хеш або None, якщо параметри не змінились)
+    return pwd_context.verify_and_update(plain_password, hashed_password)
@@ -0,0 +1,3 @@
+def catalog_key(name):
+    # Реєстр пише ту саму марку по-різному ("Toyota", "TOYOTA ", "toyota")
+    return " ".join((name or "").split()).casefold()
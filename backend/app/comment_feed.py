@@ -0,0 +1,82 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+
+class Subscription:
+    def __init__(self, plates, maxsize=SUBSCRIPTION_QUEUE_SIZE):
+        self.plates = set(plates)
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        # Повільний клієнт втрачає підписку і дочитує пропущене через GET з курсором
+        self.overflowed = False
+
+    def deliver(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class CommentBroker(ABC):
+    # Брокер для кількох воркерів (Redis, LISTEN/NOTIFY) реалізує ті самі методи:
+    # publish розсилає у спільний канал, а отримані повідомлення передає в deliver
+    @abstractmethod
+    def subscribe(self, plates):
+        ...
+
+    @abstractmethod
+    def unsubscribe(self, subscription):
+        ...
+
+    @abstractmethod
+    async def publish(self, plate, message):
+        ...
+
+
+class InProcessBroker(CommentBroker):
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, plates):
+        subscription = Subscription(plates)
+        for plate in subscription.plates:
+            self._subscribers[plate].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        for plate in subscription.plates:
+            subscribers = self._subscribers.get(plate)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[plate]
+
+    def deliver(self, plate, message):
+        for subscription in list(self._subscribers.get(plate, ())):
+            subscription.deliver(message)
+
+    async def publish(self, plate, message):
+        self.deliver(plate, message)
+
+    def stats(self):
+        return {
+            "plates": len(self._subscribers),
+            "subscriptions": len({s for subs in self._subscribers.values() for s in subs}),
+        }
+
+
+comment_broker = InProcessBroker()
+
+
+def set_comment_broker(broker):
+    global comment_broker
+    comment_broker = broker
+
+
+def get_comment_broker():
+    return comment_broker
@@ -0,0 +1,17 @@
+import base64
+import binascii
+from fastapi import HTTPException
+
+# Курсор непрозорий: кирилиця не проходить у latin-1 заголовок,
+# а "+" у незакодованому параметрі запиту перетворюється на пробіл
+
+
+def encode_cursor(value):
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        return base64.b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Недійсний курсор")
@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+from sqlalchemy.orm import Session
+from app.db.models import DatasetGeneration
+
+GENERATION_CHECK_INTERVAL = float(os.getenv("GENERATION_CHECK_INTERVAL", "5"))
+
+
+class DatasetMeta:
+    def __init__(self, check_interval=GENERATION_CHECK_INTERVAL, clock=time.monotonic):
+        self.check_interval = check_interval
+        self.clock = clock
+        self.generation = None
+        self.synced = False
+        self._snapshot = None
+        self._next_check = 0.0
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def on_change(self, callback):
+        self._listeners.append(callback)
+
+    def sync(self, db: Session):
+        # Статистику рахує інжест; тут лише дешева перевірка активного покоління
+        now = self.clock()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+            active = (
+                db.query(DatasetGeneration.id, DatasetGeneration.activated_at)
+                .filter(DatasetGeneration.status == "active")
+                .first()
+            )
+            generation = tuple(active) if active else None
+            if self.synced and generation == self.generation:
+                return
+            self._snapshot = self._load(db, generation[0]) if generation else None
+            changed = self.synced
+            self.generation = generation
+            self.synced = True
+        if changed:
+            for callback in self._listeners:
+                callback()
+
+    def _load(self, db, generation_id):
+        record = db.get(DatasetGeneration, generation_id)
+        return {
+            "generation_id": record.id,
+            "snapshot_at": record.snapshot_at,
+            "activated_at": record.activated_at,
+            "total_cars": record.rows,
+            "makes": record.make_counts or {},
+            "regions": record.region_counts or {},
+        }
+
+    def snapshot(self, db: Session):
+        self.sync(db)
+        return self._snapshot
+
+
+dataset_meta = DatasetMeta()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, JSON, func
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -6,24 +6,109 @@ class Car(Base):
     __tablename__ = "cars"
 
     id = Column(Integer, primary_key=True, index=True)
-    vin = Column(String, unique=True, index=True)
-    plate = Column(String, index=True)
+    vin = Column(String, index=True)
+    plate = Column(String, unique=True, index=True)
     make = Column(String)
     model = Column(String)
     year = Column(Integer)
     engine_capacity = Column(String)
+    make_key = Column(String)
+    model_key = Column(String)
+    region = Column(String(2))
+
+# Каталог марок і моделей читає номери лише з індексу, без звернень до таблиці
+Index("ix_cars_make_model_plate", Car.make_key, Car.model_key, Car.plate)
+Index("ix_cars_make_model_region", Car.make_key, Car.model_key, Car.region)
+
+# Пошук за шаблоном: діапазон за префіксом номера або за блоком цифр (позиції 3-6).
+# У PostgreSQL індекси будуються з COLLATE "C", щоб порівняння були побайтовими
+Index("ix_cars_plate_c", Car.plate.collate("C")).ddl_if(dialect="postgresql")
+Index("ix_cars_plate_digits_c", func.substr(Car.plate, 3, 4).collate("C")).ddl_if(dialect="postgresql")
+Index("ix_cars_plate_digits", func.substr(Car.plate, 3, 4)).ddl_if(dialect="sqlite")
 
 class CarHistory(Base):
     __tablename__ = "car_history"
+    __table_args__ = (Index("ix_car_history_plate_valid_from", "plate", "valid_from"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    plate = Column(String, index=True)
+    plate = Column(String)
     vin = Column(String, nullable=True)
     make = Column(String, nullable=True)
     model = Column(String, nullable=True)
     year = Column(Integer, nullable=True)
     engine_capacity = Column(String, nullable=True)
+    valid_from = Column(DateTime(timezone=True), server_default=func.now())
+    valid_to = Column(DateTime(timezone=True), nullable=True)
+
+class CarFingerprint(Base):
+    __tablename__ = "car_fingerprints"
+
+    plate = Column(String, primary_key=True)
+    fingerprint = Column(String)
+
+class DatasetGeneration(Base):
+    __tablename__ = "dataset_generations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, default="building")
+    rows = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    activated_at = Column(DateTime(timezone=True), nullable=True)
+    snapshot_at = Column(DateTime(timezone=True), nullable=True)
+    make_counts = Column(JSON, nullable=True)
+    region_counts = Column(JSON, nullable=True)
+
+class CarMake(Base):
+    __tablename__ = "car_makes"
+
+    key = Column(String, primary_key=True)
+    name = Column(String)
+    cars = Column(Integer, default=0)
+    models = Column(Integer, default=0)
+
+class CarModel(Base):
+    __tablename__ = "car_models"
+
+    make_key = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    name = Column(String)
+    cars = Column(Integer, default=0)
+
+# Зведення перераховуються для кожного покоління; рядки попереднього
+# залишаються до наступного інжесту, щоб відкат не потребував перерахунку
+class MakeYearStat(Base):
+    __tablename__ = "stats_make_year"
+    dimensions = ("make_key", "year")
+
+    generation_id = Column(Integer, primary_key=True)
+    make_key = Column(String, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    cars = Column(Integer, default=0)
+
+class ModelCapacityStat(Base):
+    __tablename__ = "stats_model_capacity"
+    dimensions = ("make_key", "model_key", "engine_capacity")
+
+    generation_id = Column(Integer, primary_key=True)
+    make_key = Column(String, primary_key=True)
+    model_key = Column(String, primary_key=True)
+    engine_capacity = Column(String, primary_key=True)
+    cars = Column(Integer, default=0)
+
+class MakeRegionStat(Base):
+    __tablename__ = "stats_make_region"
+    dimensions = ("make_key", "region")
+
+    generation_id = Column(Integer, primary_key=True)
+    make_key = Column(String, primary_key=True)
+    region = Column(String(2), primary_key=True)
+    cars = Column(Integer, default=0)
+
+STATS_ROLLUPS = {
+    "make-year": MakeYearStat,
+    "model-capacity": ModelCapacityStat,
+    "make-region": MakeRegionStat,
+}
 
 class User(Base):
     __tablename__ = "users"
@@ -33,11 +118,13 @@ class User(Base):
     hashed_password = Column(String, nullable=True)
     auth_provider = Column(String, default="email")
     apple_sub = Column(String, unique=True, index=True, nullable=True)
+    guest_id = Column(String, unique=True, index=True, nullable=True)
     name = Column(String, nullable=True)
     bio = Column(String, nullable=True)
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (Index("ix_comments_plate_timestamp_id", "plate", "timestamp", "id"),)
     id = Column(Integer, primary_key=True, index=True)
     plate = Column(String, index=True)
     author = Column(String)
@@ -34,7 +34,8 @@ class CarHistorySchema(BaseModel):
     model: Optional[str] = None
     year: Optional[int] = None
     engine_capacity: Optional[str] = None
-    created_at: datetime
+    valid_from: datetime
+    valid_to: Optional[datetime] = None
 
     class Config:
         orm_mode = True
@@ -0,0 +1,77 @@
+import heapq
+from collections import defaultdict
+
+MAX_EDITS = 2
+MAX_CANDIDATES = 256
+PLATE_LENGTH = 8
+DIGIT_POSITIONS = range(2, 6)
+
+# Ймовірність, що розпізнавання повернуло один символ замість іншого (симетрично).
+# Кириличні двійники вже зведені до латиниці в normalize_plate
+CONFUSIONS = {
+    ("O", "0"): 0.9,
+    ("I", "1"): 0.9,
+    ("B", "8"): 0.8,
+    ("S", "5"): 0.7,
+    ("Z", "2"): 0.7,
+    ("G", "6"): 0.6,
+    ("D", "0"): 0.5,
+    ("A", "4"): 0.5,
+    ("Q", "0"): 0.4,
+    ("T", "7"): 0.4,
+    ("T", "1"): 0.3,
+    ("E", "3"): 0.3,
+    ("1", "7"): 0.4,
+    ("0", "8"): 0.3,
+    ("3", "8"): 0.3,
+    ("6", "8"): 0.3,
+    ("5", "6"): 0.3,
+    ("C", "O"): 0.4,
+    ("O", "D"): 0.4,
+    ("H", "M"): 0.3,
+    ("K", "X"): 0.3,
+    ("E", "C"): 0.3,
+    ("P", "R"): 0.3,
+}
+
+_SUBSTITUTES = defaultdict(list)
+for (a, b), weight in CONFUSIONS.items():
+    _SUBSTITUTES[a].append((b, weight))
+    _SUBSTITUTES[b].append((a, weight))
+
+
+def _fits(char, position):
+    if position in DIGIT_POSITIONS:
+        return char.isdigit()
+    return char.isalpha()
+
+
+def _position_options(char, position):
+    options = [(char, 1.0, 0)] if _fits(char, position) else []
+    options += [(sub, weight, 1) for sub, weight in _SUBSTITUTES[char] if _fits(sub, position)]
+    return options
+
+
+def plate_candidates(plate, max_edits=MAX_EDITS, limit=MAX_CANDIDATES):
+    # Номер має фіксовану позиційну структуру AA0000BB, тому замість індексу
+    # видалень перебираємо лише підстановки з матриці плутанини
+    if len(plate) != PLATE_LENGTH:
+        return [(plate, 1.0)]
+    options = [_position_options(char, i) for i, char in enumerate(plate)]
+    if any(not opts for opts in options):
+        return []
+    mandatory = sum(1 for i, char in enumerate(plate) if not _fits(char, i))
+    budget = max(max_edits, mandatory)
+
+    results = []
+
+    def expand(position, prefix, score, edits):
+        if position == PLATE_LENGTH:
+            results.append((score, prefix))
+            return
+        for char, weight, cost in options[position]:
+            if edits + cost <= budget:
+                expand(position + 1, prefix + char, score * weight, edits + cost)
+
+    expand(0, "", 1.0, 0)
+    return [(candidate, score) for score, candidate in heapq.nlargest(limit, results)]
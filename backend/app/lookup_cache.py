@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy.orm import Session
+from app.dataset_meta import dataset_meta
+
+LOOKUP_CACHE_SIZE = int(os.getenv("LOOKUP_CACHE_SIZE", "50000"))
+LOOKUP_CACHE_TTL = float(os.getenv("LOOKUP_CACHE_TTL", "600"))
+LOOKUP_CACHE_NEGATIVE_TTL = float(os.getenv("LOOKUP_CACHE_NEGATIVE_TTL", "60"))
+
+MISSING = object()
+
+
+class LookupCache:
+    def __init__(self, maxsize=LOOKUP_CACHE_SIZE, ttl=LOOKUP_CACHE_TTL,
+                 negative_ttl=LOOKUP_CACHE_NEGATIVE_TTL, meta=dataset_meta, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.meta = meta
+        self.clock = clock
+        # Нове покоління (або відкат) - усі збережені відповіді застаріли
+        meta.on_change(self.clear)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, plate):
+        # Повертає MISSING, якщо в кеші нічого немає, і None для збереженого 404
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(plate)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[plate]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(plate)
+            if entry[1] is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return entry[1]
+
+    def put(self, plate, value):
+        ttl = self.ttl if value is not None else self.negative_ttl
+        with self._lock:
+            self._entries[plate] = (self.clock() + ttl, value)
+            self._entries.move_to_end(plate)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def sync_generation(self, db: Session):
+        self.meta.sync(db)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "generation": self.meta.generation[0] if self.meta.generation else None,
+            }
+
+
+lookup_cache = LookupCache()
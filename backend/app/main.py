@@ -1,10 +1,10 @@
 from fastapi import FastAPI, HTTPException, Query, Depends, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal, engine
+from app.db.database import get_db, engine
 from app.auth.depencencies import get_current_user
 from app.db import models
-from app.db.models import User
+from app.auth.principal_cache import Principal
 from app.db.models import CarHistory
 from app.auth.routes import router as auth_router
 from app.auth.routes_apple import router as apple_router
@@ -15,9 +15,20 @@ from app.routers.cars import router as cars_router
 from app.routers.plate_history import router as plate_history_router
 from app.routers.vin_search import router as vin_router
 from app.routers.comments import router as comments_router
+from app.routers.plate_search import router as plate_search_router
+from app.routers.stats import router as stats_router
+from app.lookup_cache import lookup_cache, MISSING
+from app.dataset_meta import dataset_meta
+from app.plates import normalize_plate
+from app.plate_index import plate_index
+from app.fuzzy_plates import plate_candidates
 from pydantic import BaseModel
+from typing import Dict, List
 
 models.Base.metadata.create_all(bind=engine)
+# create_all не додає індекси до вже наявних таблиць, а keyset-сторінки коментарів без нього сканують таблицю
+for index in models.Comment.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
 app = FastAPI()
 router = APIRouter()
 app.include_router(auth_router)
@@ -29,6 +40,8 @@ app.include_router(cars_router)
 app.include_router(vin_router)
 app.include_router(plate_history_router)
 app.include_router(comments_router)
+app.include_router(plate_search_router)
+app.include_router(stats_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -48,32 +61,116 @@ class CarInfo(BaseModel):
     class Config:
         orm_mode = True
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+MAX_BATCH_PLATES = 300
+
+class BatchLookupRequest(BaseModel):
+    plates: List[str]
+
+class BatchLookupResponse(BaseModel):
+    found: Dict[str, CarInfo]
+    missing: List[str]
+
+class FuzzyMatch(BaseModel):
+    plate: str
+    score: float
+    car: CarInfo
+
+def to_car_info(car):
+    return CarInfo(
+        vin=car["vin"],
+        make=car["make"],
+        model=car["model"],
+        year=car["year"],
+        engineCapacity=car.get("engine_capacity", "—")
+    )
+
+def resolve_plates(plates, db, use_cache=True):
+    # Повертає CarInfo або None для кожного нормалізованого номера
+    index = plate_index.current()
+    if index is not None:
+        resolved = {}
+        for plate in plates:
+            car = index.lookup(plate)
+            resolved[plate] = to_car_info(car) if car else None
+        return resolved
+
+    resolved = {}
+    pending = []
+    if use_cache:
+        lookup_cache.sync_generation(db)
+        for plate in plates:
+            car_info = lookup_cache.get(plate)
+            if car_info is MISSING:
+                pending.append(plate)
+            else:
+                resolved[plate] = car_info
+    else:
+        pending = list(plates)
+
+    if pending:
+        cars = db.query(models.Car).filter(models.Car.plate.in_(pending)).all()
+        by_plate = {car.plate: car for car in cars}
+        for plate in pending:
+            car = by_plate.get(plate)
+            car_info = None
+            if car:
+                car_info = to_car_info({
+                    "vin": car.vin,
+                    "make": car.make,
+                    "model": car.model,
+                    "year": car.year,
+                    "engine_capacity": car.engine_capacity,
+                })
+            if use_cache:
+                lookup_cache.put(plate, car_info)
+            resolved[plate] = car_info
+    return resolved
 
 @app.get("/api/lookup", response_model=CarInfo)
 def lookup_plate(
     plate: str = Query(..., min_length=6, max_length=10),
     db: Session = Depends(get_db)
 ):
-    plate = plate.upper()
-    car = db.query(models.Car).filter(models.Car.plate == plate).first()
-    if car:
-        return CarInfo(
-            vin=car.vin,
-            make=car.make,
-            model=car.model,
-            year=car.year,
-            engineCapacity=getattr(car, "engine_capacity", "—")
-        )
-    raise HTTPException(status_code=404, detail="Автомобіль не знайдено")
+    plate = normalize_plate(plate)
+    car_info = resolve_plates([plate], db)[plate]
+    if car_info is None:
+        raise HTTPException(status_code=404, detail="Автомобіль не знайдено")
+    return car_info
+
+@app.post("/api/lookup/batch", response_model=BatchLookupResponse)
+def lookup_plates_batch(body: BatchLookupRequest, db: Session = Depends(get_db)):
+    if len(body.plates) > MAX_BATCH_PLATES:
+        raise HTTPException(status_code=400, detail=f"Не більше {MAX_BATCH_PLATES} номерів за запит")
+    # Відповідь за рядком клієнта: "ка1234ав" і "KA1234AB" - один номер, але клієнт шукає свій
+    normalized = {raw: normalize_plate(raw) for raw in body.plates}
+    resolved = resolve_plates(list(dict.fromkeys(p for p in normalized.values() if p)), db)
+    return {
+        "found": {raw: resolved[plate] for raw, plate in normalized.items() if resolved.get(plate)},
+        "missing": [raw for raw, plate in normalized.items() if not resolved.get(plate)],
+    }
+
+@app.get("/api/lookup/fuzzy", response_model=List[FuzzyMatch])
+def lookup_plate_fuzzy(
+    plate: str = Query(..., min_length=6, max_length=10),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    scored = plate_candidates(normalize_plate(plate))
+    # Кандидати здебільшого не існують, тож не засмічуємо ними кеш точних запитів
+    resolved = resolve_plates([candidate for candidate, _ in scored], db, use_cache=False)
+    matches = [
+        FuzzyMatch(plate=candidate, score=round(score, 4), car=resolved[candidate])
+        for candidate, score in scored
+        if resolved.get(candidate) is not None
+    ]
+    return matches[:limit]
+
+@app.get("/api/lookup/cache")
+def lookup_cache_stats():
+    return lookup_cache.stats()
 
 @app.get("/user/me")
-def read_users_me(current_user: User = Depends(get_current_user)):
+def read_users_me(current_user: Principal = Depends(get_current_user)):
     return {
         "user_id": current_user.id,
         "email": current_user.email,
@@ -82,6 +179,9 @@ def read_users_me(current_user: User = Depends(get_current_user)):
 
 @router.get("/api/count")
 def get_car_count(db: Session = Depends(get_db)):
+    snapshot = dataset_meta.snapshot(db)
+    if snapshot is not None and snapshot["total_cars"] is not None:
+        return {"count": snapshot["total_cars"]}
     count = db.query(models.Car).count()
     return {"count": count}
 
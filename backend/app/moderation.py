@@ -0,0 +1,114 @@
+import os
+from collections import deque
+
+MODERATION_WORDS_PATH = os.getenv("MODERATION_WORDS_PATH")
+
+# "*" в кінці - основа слова (збіг на початку слова з будь-яким закінченням),
+# без нього - лише ціле слово
+DEFAULT_WORDS = ("дурень", "дурн*", "лайка")
+
+# Латинські двійники та leetspeak зводимо до кирилиці, бо список слів український
+LOOKALIKES = str.maketrans({
+    "a": "а", "b": "в", "c": "с", "d": "д", "e": "е", "h": "н", "i": "і", "k": "к", "m": "м",
+    "o": "о", "p": "р", "t": "т", "x": "х", "y": "у", "u": "и",
+    "0": "о", "1": "і", "3": "з", "4": "ч", "6": "б", "@": "а", "$": "с",
+    "ё": "е", "ї": "і", "є": "е", "ґ": "г",
+})
+
+
+def normalize_text(text):
+    # Регістр, двійники, повтори ("дуууурень") і розділювачі всередині слова ("д.у.р.е.н.ь").
+    # Розділювач після двох і більше літер поспіль - межа слова ("ти,дурень")
+    result = []
+    previous = " "
+    letters = 0
+    for char in text.casefold().translate(LOOKALIKES):
+        if char.isalpha():
+            if char != previous:
+                result.append(char)
+            previous = char
+            letters += 1
+        elif char.isspace() or letters > 1:
+            if previous != " ":
+                result.append(" ")
+            previous = " "
+            letters = 0
+        else:
+            letters = 0
+    return "".join(result).strip()
+
+
+def load_words(path=MODERATION_WORDS_PATH):
+    if not path:
+        return list(DEFAULT_WORDS)
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+class ModerationAutomaton:
+    def __init__(self, words):
+        self._goto = [{}]
+        self._fail = [0]
+        # Для кожного вузла: (довжина збігу, чи вимагати кінець слова)
+        self._output = [[]]
+        for word in words:
+            self._add(word)
+        self._link()
+
+    def _add(self, word):
+        whole_word = not word.endswith("*")
+        pattern = normalize_text(word.rstrip("*"))
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        self._output[node].append((len(pattern), whole_word))
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def find(self, text):
+        # Один прохід нормалізованим текстом; межі слів перевіряються лише для збігів
+        text = normalize_text(text)
+        length = len(text)
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for size, whole_word in output[node]:
+                start = end - size
+                if start > 0 and text[start - 1] != " ":
+                    continue
+                if whole_word and end < length and text[end] != " ":
+                    continue
+                return text[start:end]
+        return None
+
+    def __len__(self):
+        return len(self._goto)
+
+
+moderation = ModerationAutomaton(load_words())
+
+
+def contains_profanity(text):
+    return moderation.find(text) is not None
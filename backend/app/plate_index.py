@@ -0,0 +1,155 @@
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from sqlalchemy import text
+
+PLATE_INDEX_PATH = os.getenv("PLATE_INDEX_PATH")
+PLATE_INDEX_CHECK_INTERVAL = float(os.getenv("PLATE_INDEX_CHECK_INTERVAL", "5"))
+
+MAGIC = b"PSIDX001"
+# magic, кількість записів, покоління, зміщення ключів, зміщень і записів
+HEADER = struct.Struct("<8sQQQQQ")
+# Валідний номер - 2 літери, 4 цифри, 2 літери; кирилична літера займає 2 байти UTF-8
+KEY_SIZE = 12
+OFFSET = struct.Struct("<Q")
+YEAR = struct.Struct("<H")
+FIELD_SEPARATOR = "\x1f"
+RECORD_FIELDS = ("vin", "make", "model", "engine_capacity")
+
+
+def encode_key(plate):
+    key = plate.encode("utf-8")
+    if len(key) > KEY_SIZE:
+        return None
+    return key.ljust(KEY_SIZE, b"\0")
+
+
+def _encode_record(row):
+    fields = FIELD_SEPARATOR.join(row[f] or "" for f in RECORD_FIELDS)
+    return YEAR.pack(min(max(row["year"] or 0, 0), 0xFFFF)) + fields.encode("utf-8")
+
+
+def write_plate_index(engine, path, generation_id=0):
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryFile(dir=directory) as keys, \
+            tempfile.TemporaryFile(dir=directory) as offsets, \
+            tempfile.TemporaryFile(dir=directory) as records:
+        count = 0
+        position = 0
+        with engine.connect() as conn:
+            # Двійковий пошук вимагає побайтового порядку ключів
+            collate = ' COLLATE "C"' if engine.dialect.name == "postgresql" else ""
+            rows = conn.execution_options(stream_results=True, yield_per=50_000).execute(text(
+                f"SELECT plate, vin, make, model, year, engine_capacity FROM cars "
+                f"ORDER BY plate{collate}"
+            ))
+            for row in rows:
+                key = encode_key(row.plate)
+                if key is None:
+                    continue
+                record = _encode_record(row._mapping)
+                keys.write(key)
+                offsets.write(OFFSET.pack(position))
+                records.write(record)
+                position += len(record)
+                count += 1
+        offsets.write(OFFSET.pack(position))
+
+        keys_offset = HEADER.size
+        offsets_offset = keys_offset + count * KEY_SIZE
+        records_offset = offsets_offset + (count + 1) * OFFSET.size
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".plate-index-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(HEADER.pack(MAGIC, count, generation_id,
+                                      keys_offset, offsets_offset, records_offset))
+                for part in (keys, offsets, records):
+                    part.seek(0)
+                    shutil.copyfileobj(part, out, 1024 * 1024)
+                out.flush()
+                os.fsync(out.fileno())
+            # Воркери, що вже відобразили старий файл, дочитують його без перешкод
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    print(f"Індекс номерів записано: {count} записів у {path}")
+    return count
+
+
+class PlateIndex:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.generation, self._keys, self._offsets, self._records = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Невідомий формат індексу номерів: {path}")
+
+    def _key_at(self, i):
+        start = self._keys + i * KEY_SIZE
+        return self._mm[start:start + KEY_SIZE]
+
+    def lookup(self, plate):
+        key = encode_key(plate)
+        if key is None:
+            return None
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.count or self._key_at(lo) != key:
+            return None
+
+        start, end = (OFFSET.unpack_from(self._mm, self._offsets + (lo + i) * OFFSET.size)[0]
+                      for i in (0, 1))
+        record = self._mm[self._records + start:self._records + end]
+        (year,) = YEAR.unpack_from(record, 0)
+        fields = record[YEAR.size:].decode("utf-8").split(FIELD_SEPARATOR)
+        result = dict(zip(RECORD_FIELDS, fields))
+        result["plate"] = plate
+        result["year"] = year
+        return result
+
+
+class PlateIndexReader:
+    def __init__(self, path=PLATE_INDEX_PATH, check_interval=PLATE_INDEX_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._index = None
+        self._identity = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def current(self):
+        if not self.path:
+            return None
+        now = time.monotonic()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    self._next_check = now + self.check_interval
+                    self._reload()
+        return self._index
+
+    def _reload(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._index, self._identity = None, None
+            return
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity != self._identity:
+            # Старий mmap закриється, коли на нього не залишиться посилань
+            self._index = PlateIndex(self.path)
+            self._identity = identity
+
+
+plate_index = PlateIndexReader()
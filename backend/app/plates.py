@@ -0,0 +1,27 @@
+import re
+
+CYR_TO_LAT = str.maketrans({
+    'А': 'A',
+    'В': 'B',
+    'Е': 'E',
+    'К': 'K',
+    'М': 'M',
+    'Н': 'H',
+    'О': 'O',
+    'Р': 'P',
+    'С': 'C',
+    'Т': 'T',
+    'Х': 'X',
+    'І': 'I',
+})
+
+VALID_PLATE_PATTERN = re.compile(r"^[A-ZА-ЯІЄЇҐ]{2}\d{4}[A-ZА-ЯІЄЇҐ]{2}$")
+
+def convert_cyrillic_to_latin(text):
+    return text.translate(CYR_TO_LAT)
+
+def normalize_plate(raw_plate):
+    return convert_cyrillic_to_latin(raw_plate.strip().upper())
+
+def is_valid_plate(plate):
+    return VALID_PLATE_PATTERN.match(plate) is not None
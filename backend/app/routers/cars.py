@@ -1,48 +1,118 @@
+import json
 from collections import defaultdict
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import Dict, List
-from app.db.database import get_db
-from app.db.models import Car
+from typing import Dict, List, Optional
+from app.db.database import get_db, engine
+from app.db.models import Car, CarMake, CarModel
+from app.catalog import catalog_key
+from app.plates import normalize_plate
+from app.cursors import encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/cars", tags=["cars"])
 
+MAX_PAGE_SIZE = 5000
+STREAM_BATCH_SIZE = 5000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 @router.get("/brands", response_model=list[str])
 def get_brands(db: Session = Depends(get_db)):
-    brands = db.query(Car.make).distinct().all()
+    brands = db.query(CarMake.name).all()
     return sorted([b[0] for b in brands if b[0]])
 
 @router.get("/{brand}/models", response_model=list[str])
 def get_models(brand: str, db: Session = Depends(get_db)):
-    models = db.query(Car.model).filter(Car.make.ilike(brand)).distinct().all()
+    models = db.query(CarModel.name).filter(CarModel.make_key == catalog_key(brand)).all()
     if not models:
         raise HTTPException(status_code=404, detail="Бренд не знайдено")
     return sorted([m[0] for m in models if m[0]])
 
+def _model_filters(brand, model):
+    return (Car.make_key == catalog_key(brand), Car.model_key == catalog_key(model))
+
+def _plates_query(brand, model, after, region=None):
+    query = select(Car.plate).where(*_model_filters(brand, model))
+    if region:
+        # Регіон - префікс номера, тож це діапазон у тому ж індексі (make_key, model_key, plate)
+        region = normalize_plate(region)
+        query = query.where(Car.plate >= region, Car.plate < region[:-1] + chr(ord(region[-1]) + 1))
+    if after:
+        query = query.where(Car.plate > normalize_plate(decode_cursor(after)))
+    return query.order_by(Car.plate)
+
+def _fetch_plates(db, query, limit, response, after=None):
+    # Keyset-пагінація: курсор - останній номер сторінки, наступна починається після нього.
+    # Порожня сторінка після курсора - кінець даних, а не невідома модель
+    if limit is None:
+        plates = db.execute(query).scalars().all()
+    else:
+        plates = db.execute(query.limit(limit + 1)).scalars().all()
+        if len(plates) > limit:
+            plates = plates[:limit]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(plates[-1])
+    if not plates and not after:
+        raise HTTPException(status_code=404, detail="Номери не знайдено")
+    return plates
+
+def _stream_ndjson(db, query, to_line, after=None):
+    if not after and db.execute(query.limit(1)).first() is None:
+        raise HTTPException(status_code=404, detail="Номери не знайдено")
+
+    def lines():
+        # Окреме з'єднання з серверним курсором: сесія запиту закривається раніше за стрім
+        with engine.connect() as conn:
+            rows = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE).execute(query)
+            for (plate,) in rows:
+                yield json.dumps(to_line(plate), ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.get("/{brand}/{model}/plates", response_model=list[str])
-def get_plates(brand: str, model: str, db: Session = Depends(get_db)):
-    plates = db.query(Car.plate).filter(
-        Car.make.ilike(brand),
-        Car.model.ilike(model)
+def get_plates(
+    brand: str,
+    model: str,
+    response: Response,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
+    db: Session = Depends(get_db)
+):
+    query = _plates_query(brand, model, after)
+    if stream:
+        return _stream_ndjson(db, query, lambda plate: plate, after)
+    return _fetch_plates(db, query, limit, response, after)
+
+@router.get("/{brand}/{model}/plates/regions", response_model=Dict[str, int])
+def get_plate_regions(brand: str, model: str, db: Session = Depends(get_db)):
+    counts = db.execute(
+        select(Car.region, func.count())
+        .where(*_model_filters(brand, model))
+        .group_by(Car.region)
+        .order_by(Car.region)
     ).all()
-    if not plates:
+    if not counts:
         raise HTTPException(status_code=404, detail="Номери не знайдено")
-    return [p[0] for p in plates if p[0]]
+    return {region: count for region, count in counts}
 
 @router.get("/{brand}/{model}/plates/grouped", response_model=Dict[str, List[str]])
-def get_grouped_plates(brand: str, model: str, db: Session = Depends(get_db)):
-    cars = db.query(Car.plate).filter(
-        Car.make.ilike(brand),
-        Car.model.ilike(model)
-    ).all()
-    if not cars:
-        raise HTTPException(status_code=404, detail="Номери не знайдено")
+def get_grouped_plates(
+    brand: str,
+    model: str,
+    response: Response,
+    region: Optional[str] = Query(None, min_length=2, max_length=2),
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    stream: bool = False,
+    db: Session = Depends(get_db)
+):
+    query = _plates_query(brand, model, after, region)
+    if stream:
+        return _stream_ndjson(db, query, lambda plate: {"region": plate[:2], "plate": plate}, after)
 
     grouped = defaultdict(list)
-    for (plate,) in cars:
-        if not plate:
-            continue
-        prefix = plate[:2].upper() if len(plate) >= 2 else "??"
-        grouped[prefix].append(plate)
-
-    return {k: sorted(v) for k, v in sorted(grouped.items())}
+    # Номери вже впорядковані, тож регіони йдуть суцільними блоками
+    for plate in _fetch_plates(db, query, limit, response, after):
+        grouped[plate[:2]].append(plate)
+    return dict(grouped)
@@ -1,28 +1,139 @@
+import asyncio
 import datetime
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from app.auth.depencencies import get_current_user
-from app.db.models import Comment, User
-from app.db.database import get_db
+from app.db.models import Comment
+from app.auth.principal_cache import Principal
+from app.db.database import get_async_db
+from app.moderation import contains_profanity
+from app.comment_feed import get_comment_broker
+from app.cursors import encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/api/comments", tags=["comments"])
 
+MAX_PAGE_SIZE = 200
+MAX_WATCHED_PLATES = 50
+HEARTBEAT_INTERVAL = 15
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def comment_cursor(comment):
+    return encode_cursor(f"{comment.timestamp.isoformat()}|{comment.id}")
+
+def parse_cursor(cursor):
+    try:
+        timestamp, comment_id = decode_cursor(cursor).rsplit("|", 1)
+        return datetime.datetime.fromisoformat(timestamp), int(comment_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Недійсний курсор")
+
+def comment_payload(comment):
+    return {
+        "id": comment.id,
+        "plate": comment.plate,
+        "author": comment.author,
+        "text": comment.text,
+        "timestamp": comment.timestamp.isoformat(),
+        "cursor": comment_cursor(comment),
+    }
+
+async def comments_after(db, plates, cursor):
+    rows = await db.scalars(
+        select(Comment)
+        .where(Comment.plate.in_(plates), tuple_(Comment.timestamp, Comment.id) > parse_cursor(cursor))
+        .order_by(Comment.timestamp, Comment.id)
+    )
+    return rows.all()
+
+def _sse(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+@router.get("/stream")
+async def stream_comments(
+    request: Request,
+    plates: List[str] = Query(..., max_length=MAX_WATCHED_PLATES),
+    db: AsyncSession = Depends(get_async_db),
+):
+    broker = get_comment_broker()
+    # Підписуємось до дочитування, щоб не загубити коментар між запитом і підпискою
+    subscription = broker.subscribe(plates)
+    last_event_id = request.headers.get("Last-Event-ID")
+    try:
+        missed = await comments_after(db, plates, last_event_id) if last_event_id else []
+        missed = [comment_payload(comment) for comment in missed]
+    except Exception:
+        broker.unsubscribe(subscription)
+        raise
+    finally:
+        # Стрім живе довго - з'єднання з пулу не повинно триматися весь цей час
+        await db.close()
+
+    async def events():
+        sent = set()
+        try:
+            for message in missed:
+                sent.add(message["id"])
+                yield _sse("comment", message, message["cursor"])
+            while not await request.is_disconnected():
+                if subscription.overflowed:
+                    yield _sse("overflow", {})
+                    return
+                try:
+                    message = await subscription.get(HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if message["id"] in sent:
+                    continue
+                yield _sse("comment", message, message["cursor"])
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
 @router.get("/{plate}")
-async def get_comments(plate: str, db: Session = Depends(get_db)):
-    comments = (
-        db.query(Comment)
-        .filter(Comment.plate == plate)
-        .order_by(Comment.timestamp.desc())
-        .all()
+async def get_comments(
+    plate: str,
+    response: Response,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # before - старіші за курсор (сторінки від нових до старих), after - лише нові від курсора
+    if after:
+        return await comments_after(db, [plate], after)
+
+    query = (
+        select(Comment)
+        .where(Comment.plate == plate)
+        .order_by(Comment.timestamp.desc(), Comment.id.desc())
     )
+    if before:
+        query = query.where(tuple_(Comment.timestamp, Comment.id) < parse_cursor(before))
+    if limit is not None:
+        query = query.limit(limit + 1)
+    comments = (await db.scalars(query)).all()
+    if limit is not None and len(comments) > limit:
+        comments = comments[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = comment_cursor(comments[-1])
     return comments
 
 @router.post("/{plate}", status_code=201)
 async def add_comment(
     plate: str,
     data: dict,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
 ):
     text = data.get("text", "").strip()
     if not text:
@@ -38,12 +149,7 @@ async def add_comment(
         timestamp=datetime.datetime.utcnow(),
     )
     db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    await db.commit()
+    await db.refresh(comment)
+    await get_comment_broker().publish(plate, comment_payload(comment))
     return comment
-
-def contains_profanity(text: str) -> bool:
-    words = set(text.lower().split())
-    return any(bad in words for bad in BAD_WORDS)
-
-BAD_WORDS = {"дурень", "лайка", "*****"}
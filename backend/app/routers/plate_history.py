@@ -8,7 +8,12 @@ router = APIRouter(prefix="/api/plate_history", tags=["plate_history"])
 
 @router.get("/plate_history/{plate}", response_model=list[CarHistorySchema])
 def get_plate_history(plate: str, db: Session = Depends(get_db)):
-    history = db.query(CarHistory).filter(CarHistory.plate == plate).all()
+    history = (
+        db.query(CarHistory)
+        .filter(CarHistory.plate == plate)
+        .order_by(CarHistory.valid_from)
+        .all()
+    )
     if not history:
         raise HTTPException(status_code=404, detail="No history found for this plate")
     return history
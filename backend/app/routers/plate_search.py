@@ -0,0 +1,84 @@
+import re
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.db.database import get_db
+from app.db.models import Car
+from app.plates import normalize_plate
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+PLATE_LENGTH = 8
+DIGITS_START = 2
+DIGITS_LENGTH = 4
+VALID_PATTERN = re.compile(r"^[A-ZА-ЯІЄЇҐ0-9?*]+$")
+# Позиції вбудовані в SQL: з параметрами substr(plate, ?, ?) не збігається з виразом індексу
+PLATE_DIGITS = func.substr(Car.plate, literal_column(str(DIGITS_START + 1)), literal_column(str(DIGITS_LENGTH)))
+
+class PlateSearchItem(BaseModel):
+    plate: str
+    make: Optional[str] = None
+    model: Optional[str] = None
+    year: Optional[int] = None
+
+class PlateSearchPage(BaseModel):
+    items: List[PlateSearchItem]
+    next_cursor: Optional[str] = None
+
+def _upper_bound(prefix):
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def _known_run(pattern, start, length):
+    run = ""
+    for char in pattern[start:start + length]:
+        if char in "?*":
+            break
+        run += char
+    return run
+
+def build_plate_filters(pattern, plate_expr, digits_expr):
+    # "?" - рівно один символ, "*" - будь-яка кількість; без "*" шаблон вважається префіксом
+    like = pattern.replace("?", "_").replace("*", "%")
+    if "*" not in pattern and len(pattern) < PLATE_LENGTH:
+        like += "%"
+    filters = [plate_expr.like(like)]
+
+    prefix = _known_run(pattern, 0, PLATE_LENGTH)
+    # Цифри стоять на своїх позиціях, якщо перед ними немає "*"; _known_run сам зупиняється на "*"
+    positional = "*" not in pattern[:DIGITS_START]
+    digits = _known_run(pattern, DIGITS_START, DIGITS_LENGTH) if positional else ""
+    if prefix:
+        filters += [plate_expr >= prefix, plate_expr < _upper_bound(prefix)]
+    elif digits:
+        filters += [digits_expr >= digits, digits_expr < _upper_bound(digits)]
+    return filters
+
+@router.get("/plates", response_model=PlateSearchPage)
+def search_plates(
+    pattern: str = Query(..., min_length=1, max_length=PLATE_LENGTH),
+    after: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    pattern = normalize_plate(pattern)
+    if not VALID_PATTERN.match(pattern) or not pattern.strip("?*"):
+        raise HTTPException(status_code=400, detail="Недійсний шаблон номера")
+
+    plate_expr = Car.plate
+    digits_expr = PLATE_DIGITS
+    if db.get_bind().dialect.name == "postgresql":
+        plate_expr = plate_expr.collate("C")
+        digits_expr = digits_expr.collate("C")
+
+    query = db.query(Car.plate, Car.make, Car.model, Car.year).filter(
+        *build_plate_filters(pattern, plate_expr, digits_expr)
+    )
+    if after:
+        query = query.filter(plate_expr > normalize_plate(after))
+    rows = query.order_by(plate_expr).limit(limit + 1).all()
+
+    items = [PlateSearchItem(plate=r.plate, make=r.make, model=r.model, year=r.year) for r in rows[:limit]]
+    next_cursor = items[-1].plate if len(rows) > limit else None
+    return PlateSearchPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.db.database import get_db
+from app.db.models import STATS_ROLLUPS
+from app.dataset_meta import dataset_meta
+from app.catalog import catalog_key
+from app.plates import normalize_plate
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+class DatasetStats(BaseModel):
+    generation_id: int
+    snapshot_at: Optional[datetime]
+    activated_at: Optional[datetime]
+    total_cars: int
+    makes: Dict[str, int]
+    regions: Dict[str, int]
+
+
+@router.get("", response_model=DatasetStats)
+def get_dataset_stats(db: Session = Depends(get_db)):
+    snapshot = dataset_meta.snapshot(db)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Статистика ще не зібрана")
+    return snapshot
+
+
+class RollupRow(BaseModel):
+    make_key: Optional[str] = None
+    model_key: Optional[str] = None
+    year: Optional[int] = None
+    engine_capacity: Optional[str] = None
+    region: Optional[str] = None
+    cars: int
+
+
+@router.get("/{rollup}", response_model=List[RollupRow], response_model_exclude_none=True)
+def get_rollup(
+    rollup: str,
+    make: Optional[str] = None,
+    model: Optional[str] = None,
+    year: Optional[int] = None,
+    engine_capacity: Optional[str] = None,
+    region: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    table = STATS_ROLLUPS.get(rollup)
+    if table is None:
+        raise HTTPException(status_code=404, detail="Невідоме зведення")
+    snapshot = dataset_meta.snapshot(db)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Статистика ще не зібрана")
+
+    filters = {
+        "make_key": catalog_key(make) if make is not None else None,
+        "model_key": catalog_key(model) if model is not None else None,
+        "year": year,
+        "engine_capacity": engine_capacity,
+        "region": normalize_plate(region) if region is not None else None,
+    }
+    query = db.query(table).filter(table.generation_id == snapshot["generation_id"])
+    for column, value in filters.items():
+        if value is None:
+            continue
+        if column not in table.dimensions:
+            raise HTTPException(status_code=400, detail=f"Зведення {rollup} не має виміру {column}")
+        query = query.filter(getattr(table, column) == value)
+
+    rows = query.order_by(*(getattr(table, c) for c in table.dimensions)).all()
+    return [
+        RollupRow(cars=row.cars, **{c: getattr(row, c) for c in table.dimensions})
+        for row in rows
+    ]
@@ -4,6 +4,8 @@ from app.db.database import get_db
 from app.db.models import User
 from app.db.schemas import UserUpdate
 from app.auth.depencencies import get_current_user
+from app.auth.principal_cache import Principal, principal_cache
+from app.auth.guest import get_or_create_guest_user
 
 router = APIRouter(prefix="/user", tags=["user"])
 
@@ -11,9 +13,12 @@ router = APIRouter(prefix="/user", tags=["user"])
 def update_user_profile(
     update_data: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    user = db.query(User).filter(User.id == current_user.id).first()
+    if current_user.guest_id:
+        user = get_or_create_guest_user(db, current_user.guest_id)
+    else:
+        user = db.query(User).filter(User.id == current_user.id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -24,6 +29,7 @@ def update_user_profile(
 
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(current_user.cache_key)
 
     return {
         "id": user.id,
@@ -0,0 +1,125 @@
+import io
+import os
+import time
+from itertools import islice
+from sqlalchemy import text
+from app.tasks.delta_ingest import apply_delta, report_delta_summary
+from app.tasks.dataset_stats import collect_dataset_stats
+
+DEFAULT_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "50000"))
+STAGING_TABLE = "cars_staging"
+CAR_COLUMNS = ("plate", "vin", "make", "model", "year", "engine_capacity", "make_key", "model_key", "region")
+STAGING_COLUMNS = CAR_COLUMNS + ("fingerprint", "seq")
+
+_COLUMN_LIST = ", ".join(CAR_COLUMNS)
+_STAGING_COLUMN_LIST = ", ".join(STAGING_COLUMNS)
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def _iter_batches(rows, batch_size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class BulkLoader:
+    def __init__(self, engine, batch_size=None):
+        self.engine = engine
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self.use_copy = engine.dialect.name == "postgresql"
+
+    def truncate(self, conn, table):
+        if self.use_copy:
+            conn.execute(text(f"TRUNCATE TABLE {table} RESTART IDENTITY CASCADE"))
+        else:
+            conn.execute(text(f"DELETE FROM {table}"))
+
+    def create_staging(self, conn):
+        unlogged = "UNLOGGED " if self.use_copy else ""
+        conn.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+        conn.execute(text(
+            f"CREATE {unlogged}TABLE {STAGING_TABLE} ("
+            "plate VARCHAR, vin VARCHAR, make VARCHAR, model VARCHAR, "
+            "year INTEGER, engine_capacity VARCHAR, make_key VARCHAR, model_key VARCHAR, "
+            "region VARCHAR(2), fingerprint VARCHAR, seq BIGINT)"
+        ))
+
+    def stage(self, conn, car_rows, stats):
+        seq = 0
+        for batch in _iter_batches(car_rows, self.batch_size):
+            started = time.monotonic()
+            for row in batch:
+                row["seq"] = seq
+                seq += 1
+            if self.use_copy:
+                self._copy_batch(conn, batch)
+            else:
+                conn.execute(
+                    text(f"INSERT INTO {STAGING_TABLE} ({_STAGING_COLUMN_LIST}) "
+                         f"VALUES ({', '.join(':' + c for c in STAGING_COLUMNS)})"),
+                    batch,
+                )
+            stats["rows_written"] += len(batch)
+            print(f"Записано пакет з {len(batch)} рядків за {time.monotonic() - started:.2f} с")
+        self.deduplicate(conn, stats)
+
+    def deduplicate(self, conn, stats):
+        # Залишаємо перше входження номера в порядку CSV, як і раніше
+        result = conn.execute(text(
+            f"DELETE FROM {STAGING_TABLE} WHERE seq IN ("
+            f"SELECT seq FROM (SELECT seq, ROW_NUMBER() OVER (PARTITION BY plate ORDER BY seq) AS rn "
+            f"FROM {STAGING_TABLE}) ranked WHERE rn > 1)"
+        ))
+        stats["skipped_duplicates_csv"] += result.rowcount
+        stats["rows_written"] -= result.rowcount
+
+    def _copy_batch(self, conn, batch):
+        buf = io.StringIO()
+        for row in batch:
+            buf.write("\t".join(_copy_value(row[c]) for c in STAGING_COLUMNS))
+            buf.write("\n")
+        buf.seek(0)
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY {STAGING_TABLE} ({_STAGING_COLUMN_LIST}) FROM STDIN", buf)
+        finally:
+            cursor.close()
+
+    def write_history(self, conn, stats):
+        stats["delta"] = apply_delta(conn, STAGING_TABLE)
+        report_delta_summary(stats["delta"], stats["rows_written"])
+
+    def upsert_cars(self, conn):
+        updates = ", ".join(f"{c} = excluded.{c}" for c in CAR_COLUMNS if c != "plate")
+        # "WHERE true" потрібен SQLite, щоб розрізнити ON CONFLICT від JOIN-синтаксису
+        conn.execute(text(
+            f"INSERT INTO cars ({_COLUMN_LIST}) "
+            f"SELECT {_COLUMN_LIST} FROM {STAGING_TABLE} WHERE true "
+            f"ON CONFLICT (plate) DO UPDATE SET {updates}"
+        ))
+
+    def fill_table(self, conn, table):
+        conn.execute(text(
+            f"INSERT INTO {table} (id, {_COLUMN_LIST}) "
+            f"SELECT ROW_NUMBER() OVER (ORDER BY plate), {_COLUMN_LIST} FROM {STAGING_TABLE}"
+        ))
+
+    def load(self, car_rows, stats):
+        with self.engine.begin() as conn:
+            self.create_staging(conn)
+            self.stage(conn, car_rows, stats)
+            print("Злиття staging-таблиці з cars та car_history")
+            self.write_history(conn, stats)
+            self.upsert_cars(conn)
+            self.truncate(conn, STAGING_TABLE)
+            stats["dataset"] = collect_dataset_stats(conn, "cars")
+        return stats
@@ -0,0 +1,78 @@
+from sqlalchemy import text
+from app.db.models import CarMake, CarModel, DatasetGeneration, STATS_ROLLUPS
+
+
+def collect_catalog(conn, table):
+    # Композитний індекс (make_key, model_key, plate) покриває групування
+    rows = conn.execute(text(
+        f"SELECT make_key, model_key, MIN(make), MIN(model), COUNT(*) FROM {table} "
+        f"WHERE make_key <> '' GROUP BY make_key, model_key"
+    ))
+    return [
+        {"make_key": make_key, "key": model_key, "make": make, "name": model, "cars": count}
+        for make_key, model_key, make, model, count in rows
+    ]
+
+
+def store_catalog(conn, catalog):
+    makes = {}
+    for row in catalog:
+        make = makes.setdefault(row["make_key"], {
+            "key": row["make_key"], "name": row["make"], "cars": 0, "models": 0,
+        })
+        make["cars"] += row["cars"]
+        make["name"] = min(make["name"], row["make"])
+        if row["key"]:
+            make["models"] += 1
+    models = [
+        {"make_key": row["make_key"], "key": row["key"], "name": row["name"], "cars": row["cars"]}
+        for row in catalog if row["key"]
+    ]
+    conn.execute(CarModel.__table__.delete())
+    conn.execute(CarMake.__table__.delete())
+    if makes:
+        conn.execute(CarMake.__table__.insert(), list(makes.values()))
+    if models:
+        conn.execute(CarModel.__table__.insert(), models)
+
+
+def collect_dataset_stats(conn, table):
+    makes = {
+        make or "": count
+        for make, count in conn.execute(text(f"SELECT make, COUNT(*) FROM {table} GROUP BY make"))
+    }
+    regions = {
+        region: count
+        for region, count in conn.execute(text(
+            f"SELECT region, COUNT(*) FROM {table} GROUP BY region"
+        ))
+    }
+    return {
+        "total": sum(makes.values()),
+        "makes": makes,
+        "regions": regions,
+        "catalog": collect_catalog(conn, table),
+    }
+
+
+def _rollup_key(column):
+    # Виміри входять у первинний ключ, тож NULL замінюємо на "невідомо"
+    return f"COALESCE({column}, {'0' if column == 'year' else repr('')})"
+
+
+def refresh_rollups(conn, generation_id, table):
+    for rollup in STATS_ROLLUPS.values():
+        columns = ", ".join(rollup.dimensions)
+        keys = ", ".join(_rollup_key(c) for c in rollup.dimensions)
+        conn.execute(text(f"DELETE FROM {rollup.__tablename__} WHERE generation_id = :generation_id"),
+                     {"generation_id": generation_id})
+        conn.execute(text(
+            f"INSERT INTO {rollup.__tablename__} (generation_id, {columns}, cars) "
+            f"SELECT :generation_id, {keys}, COUNT(*) FROM {table} GROUP BY {keys}"
+        ), {"generation_id": generation_id})
+
+
+def prune_rollups(conn):
+    kept = (f"SELECT id FROM {DatasetGeneration.__tablename__} WHERE status IN ('active', 'previous')")
+    for rollup in STATS_ROLLUPS.values():
+        conn.execute(text(f"DELETE FROM {rollup.__tablename__} WHERE generation_id NOT IN ({kept})"))
@@ -0,0 +1,180 @@
+import datetime
+from sqlalchemy import inspect, text, update
+from app.db.models import DatasetGeneration
+from app.tasks.bulk_loader import STAGING_TABLE
+from app.tasks.dataset_stats import (
+    collect_dataset_stats, collect_catalog, store_catalog, refresh_rollups, prune_rollups,
+)
+
+LIVE_TABLE = "cars"
+SHADOW_TABLE = "cars_next"
+PREVIOUS_TABLE = "cars_prev"
+SWAP_LOCK_TIMEOUT = "10s"
+
+generations = DatasetGeneration.__table__
+
+
+def _is_postgres(conn):
+    return conn.dialect.name == "postgresql"
+
+
+def start_generation(engine):
+    with engine.begin() as conn:
+        result = conn.execute(generations.insert().values(status="building"))
+        return result.inserted_primary_key[0]
+
+
+def create_shadow_table(conn):
+    # Після обміну ця таблиця стає cars, і завантаження --in-place вставляє нові номери без id
+    id_column = "id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY" if _is_postgres(conn) \
+        else "id INTEGER PRIMARY KEY"
+    conn.execute(text(f"DROP TABLE IF EXISTS {SHADOW_TABLE}"))
+    conn.execute(text(
+        f"CREATE TABLE {SHADOW_TABLE} ("
+        f"{id_column}, vin VARCHAR, plate VARCHAR NOT NULL, make VARCHAR, "
+        "model VARCHAR, year INTEGER, engine_capacity VARCHAR, make_key VARCHAR, model_key VARCHAR, "
+        "region VARCHAR(2))"
+    ))
+
+
+def sync_shadow_identity(conn):
+    # fill_table задає id явно, тож послідовність треба підвести до максимального id
+    if _is_postgres(conn):
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{SHADOW_TABLE}', 'id'), "
+            f"COALESCE(MAX(id), 0) + 1, false) FROM {SHADOW_TABLE}"
+        ))
+
+
+def index_shadow_table(conn, generation_id):
+    # Імена індексів не змінюються при RENAME TABLE, тому додаємо номер покоління
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX ix_cars_g{generation_id}_plate ON {SHADOW_TABLE} (plate)"
+    ))
+    conn.execute(text(f"CREATE INDEX ix_cars_g{generation_id}_vin ON {SHADOW_TABLE} (vin)"))
+    conn.execute(text(
+        f"CREATE INDEX ix_cars_g{generation_id}_make_model_plate "
+        f"ON {SHADOW_TABLE} (make_key, model_key, plate)"
+    ))
+    conn.execute(text(
+        f"CREATE INDEX ix_cars_g{generation_id}_make_model_region "
+        f"ON {SHADOW_TABLE} (make_key, model_key, region)"
+    ))
+    if _is_postgres(conn):
+        conn.execute(text(
+            f'CREATE INDEX ix_cars_g{generation_id}_plate_c ON {SHADOW_TABLE} (plate COLLATE "C")'
+        ))
+        conn.execute(text(
+            f"CREATE INDEX ix_cars_g{generation_id}_plate_digits_c "
+            f'ON {SHADOW_TABLE} ((substr(plate, 3, 4) COLLATE "C"))'
+        ))
+    else:
+        conn.execute(text(
+            f"CREATE INDEX ix_cars_g{generation_id}_plate_digits ON {SHADOW_TABLE} (substr(plate, 3, 4))"
+        ))
+    conn.execute(text(f"ANALYZE {SHADOW_TABLE}"))
+
+
+def build_shadow_generation(engine, loader, car_rows, stats):
+    generation_id = start_generation(engine)
+    print(f"Побудова покоління {generation_id} у таблиці {SHADOW_TABLE}")
+    try:
+        with engine.begin() as conn:
+            create_shadow_table(conn)
+            loader.create_staging(conn)
+            loader.stage(conn, car_rows, stats)
+            loader.write_history(conn, stats)
+            loader.fill_table(conn, SHADOW_TABLE)
+            sync_shadow_identity(conn)
+            index_shadow_table(conn, generation_id)
+            stats["dataset"] = collect_dataset_stats(conn, SHADOW_TABLE)
+            refresh_rollups(conn, generation_id, SHADOW_TABLE)
+            loader.truncate(conn, STAGING_TABLE)
+    except Exception:
+        with engine.begin() as conn:
+            conn.execute(
+                update(generations).where(generations.c.id == generation_id).values(status="failed")
+            )
+        raise
+    return generation_id
+
+
+def activate_generation(conn, generation_id, rows, dataset_stats=None, snapshot_at=None):
+    dataset_stats = dataset_stats or {}
+    conn.execute(
+        update(generations)
+        .where(generations.c.status == "previous")
+        .values(status="retired")
+    )
+    conn.execute(
+        update(generations)
+        .where(generations.c.status == "active")
+        .values(status="previous")
+    )
+    conn.execute(
+        update(generations)
+        .where(generations.c.id == generation_id)
+        .values(
+            status="active",
+            rows=rows,
+            activated_at=datetime.datetime.utcnow(),
+            snapshot_at=snapshot_at,
+            make_counts=dataset_stats.get("makes"),
+            region_counts=dataset_stats.get("regions"),
+        )
+    )
+    if "catalog" in dataset_stats:
+        store_catalog(conn, dataset_stats["catalog"])
+    prune_rollups(conn)
+
+
+def publish_in_place(engine, rows, dataset_stats=None, snapshot_at=None):
+    # Без тіньової таблиці покоління лише сповіщає API про нові дані
+    generation_id = start_generation(engine)
+    with engine.begin() as conn:
+        refresh_rollups(conn, generation_id, LIVE_TABLE)
+        activate_generation(conn, generation_id, rows, dataset_stats, snapshot_at)
+    print(f"Покоління {generation_id} активовано")
+    return generation_id
+
+
+def swap_in(engine, generation_id, rows, dataset_stats=None, snapshot_at=None):
+    with engine.begin() as conn:
+        if _is_postgres(conn):
+            conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {PREVIOUS_TABLE}"))
+        if inspect(conn).has_table(LIVE_TABLE):
+            conn.execute(text(f"ALTER TABLE {LIVE_TABLE} RENAME TO {PREVIOUS_TABLE}"))
+        conn.execute(text(f"ALTER TABLE {SHADOW_TABLE} RENAME TO {LIVE_TABLE}"))
+
+        activate_generation(conn, generation_id, rows, dataset_stats, snapshot_at)
+    print(f"Покоління {generation_id} активовано")
+
+
+def rollback(engine):
+    with engine.begin() as conn:
+        if not inspect(conn).has_table(PREVIOUS_TABLE):
+            raise Exception("Немає попереднього покоління для відкату")
+        if _is_postgres(conn):
+            conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+        conn.execute(text(f"ALTER TABLE {LIVE_TABLE} RENAME TO {SHADOW_TABLE}"))
+        conn.execute(text(f"ALTER TABLE {PREVIOUS_TABLE} RENAME TO {LIVE_TABLE}"))
+        conn.execute(text(f"ALTER TABLE {SHADOW_TABLE} RENAME TO {PREVIOUS_TABLE}"))
+
+        conn.execute(
+            update(generations)
+            .where(generations.c.status == "active")
+            .values(status="rolled_back")
+        )
+        conn.execute(
+            update(generations)
+            .where(generations.c.status == "previous")
+            .values(status="active", activated_at=datetime.datetime.utcnow())
+        )
+        conn.execute(
+            update(generations)
+            .where(generations.c.status == "rolled_back")
+            .values(status="previous")
+        )
+        store_catalog(conn, collect_catalog(conn, LIVE_TABLE))
+    print("Відкат до попереднього покоління виконано")
@@ -0,0 +1,76 @@
+import datetime
+import hashlib
+from sqlalchemy import text
+
+FINGERPRINT_FIELDS = ("plate", "vin", "make", "model", "year", "engine_capacity")
+FINGERPRINT_TABLE = "car_fingerprints"
+DELTA_TABLE = "cars_delta"
+
+_HISTORY_COLUMNS = "plate, vin, make, model, year, engine_capacity"
+
+
+def fingerprint_row(row):
+    payload = "\x1f".join(str(row[field]) for field in FINGERPRINT_FIELDS)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def apply_delta(conn, staging_table, snapshot_at=None):
+    snapshot_at = snapshot_at or datetime.datetime.now(datetime.timezone.utc)
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{staging_table}_plate ON {staging_table} (plate)"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {DELTA_TABLE}"))
+    conn.execute(text(
+        f"CREATE TEMP TABLE {DELTA_TABLE} AS "
+        f"SELECT s.plate, s.fingerprint, "
+        f"CASE WHEN f.plate IS NULL THEN 'new' ELSE 'changed' END AS change "
+        f"FROM {staging_table} s LEFT JOIN {FINGERPRINT_TABLE} f ON f.plate = s.plate "
+        f"WHERE f.plate IS NULL OR f.fingerprint <> s.fingerprint "
+        f"UNION ALL "
+        f"SELECT f.plate, NULL, 'removed' FROM {FINGERPRINT_TABLE} f "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {staging_table} s WHERE s.plate = f.plate)"
+    ))
+
+    # Кожен стан номера - окремий інтервал; змінені та зниклі номери закривають поточний
+    conn.execute(
+        text(
+            f"UPDATE car_history SET valid_to = :snapshot_at "
+            f"WHERE valid_to IS NULL AND plate IN (SELECT plate FROM {DELTA_TABLE})"
+        ),
+        {"snapshot_at": snapshot_at},
+    )
+    conn.execute(
+        text(
+            f"INSERT INTO car_history ({_HISTORY_COLUMNS}, valid_from) "
+            f"SELECT s.plate, s.vin, s.make, s.model, s.year, s.engine_capacity, :snapshot_at "
+            f"FROM {staging_table} s JOIN {DELTA_TABLE} d ON d.plate = s.plate "
+            f"WHERE d.change <> 'removed'"
+        ),
+        {"snapshot_at": snapshot_at},
+    )
+
+    conn.execute(text(
+        f"DELETE FROM {FINGERPRINT_TABLE} "
+        f"WHERE plate IN (SELECT plate FROM {DELTA_TABLE} WHERE change = 'removed')"
+    ))
+    conn.execute(text(
+        f"INSERT INTO {FINGERPRINT_TABLE} (plate, fingerprint) "
+        f"SELECT plate, fingerprint FROM {DELTA_TABLE} WHERE change <> 'removed' "
+        f"ON CONFLICT (plate) DO UPDATE SET fingerprint = excluded.fingerprint"
+    ))
+
+    summary = {"new": 0, "changed": 0, "removed": 0}
+    for change, count in conn.execute(text(
+        f"SELECT change, COUNT(*) FROM {DELTA_TABLE} GROUP BY change"
+    )):
+        summary[change] = count
+    conn.execute(text(f"DROP TABLE {DELTA_TABLE}"))
+    # Індекс потрібен лише для порівняння і не повинен гальмувати COPY наступного запуску
+    conn.execute(text(f"DROP INDEX IF EXISTS ix_{staging_table}_plate"))
+    return summary
+
+
+def report_delta_summary(summary, total_rows):
+    unchanged = total_rows - summary["new"] - summary["changed"]
+    print(
+        f"ℹЗміни реєстру: нових {summary['new']}, змінених {summary['changed']}, "
+        f"зниклих {summary['removed']}, без змін {unchanged}."
+    )
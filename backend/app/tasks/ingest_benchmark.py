@@ -0,0 +1,144 @@
+import argparse
+import datetime
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+from app.tasks.synthetic_registry import parse_row_count, write_registry_zip
+from app.tasks.registry_standin import serve_registry
+
+
+def _rss_mb(who):
+    peak = resource.getrusage(who).ru_maxrss
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+def _timed(iterable, timings, key):
+    # Час усередині генератора - це розпакування, декодування та розбір рядків
+    iterator = iter(iterable)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            timings[key] += time.perf_counter() - started
+            return
+        timings[key] += time.perf_counter() - started
+        yield item
+
+
+def _unzip_pass(archive_path):
+    with zipfile.ZipFile(archive_path) as z:
+        member = max((i for i in z.infolist() if i.filename.lower().endswith(".csv")),
+                     key=lambda i: i.date_time)
+        with z.open(member) as raw:
+            while raw.read(1024 * 1024):
+                pass
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Бенчмарк імпорту реєстру на синтетичних даних")
+    parser.add_argument("--rows", default="10k", help="кількість рядків: 10k, 1m, 10m або число")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-url", default=None,
+                        help="за замовчуванням - тимчасова SQLite база")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--in-place", action="store_true")
+    parser.add_argument("--output", default=None, help="файл для JSON-звіту")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rows = parse_row_count(args.rows)
+    work_dir = tempfile.mkdtemp(prefix="ingest-bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(work_dir, 'bench.db')}"
+    # Модулі імпорту створюють engine під час імпорту, тому URL задаємо до нього
+    os.environ["DATABASE_URL"] = database_url
+    from app.db.models import Base
+    from app.tasks import download_and_update as ingest
+    from app.tasks.parallel_parse import iter_car_rows_parallel
+    from app.tasks.registry_fetch import RegistryFetcher
+
+    timings = dict.fromkeys(("generate", "download", "unzip", "parse", "write", "total"), 0.0)
+    stats = ingest.new_ingest_stats()
+    stage = "generate"
+    error = None
+    load_time = None
+    source_path = os.path.join(work_dir, "reestrtz_synthetic.zip")
+    try:
+        started = time.perf_counter()
+        write_registry_zip(source_path, rows, args.seed)
+        timings["generate"] = time.perf_counter() - started
+
+        stage = "download"
+        Base.metadata.create_all(bind=ingest.engine)
+        with serve_registry(source_path) as url:
+            pipeline_started = time.perf_counter()
+            fetcher = RegistryFetcher(url, state_dir=os.path.join(work_dir, "state"))
+            fetcher.fetch(conditional=False)
+            timings["download"] = time.perf_counter() - pipeline_started
+
+        stage = "unzip"
+        started = time.perf_counter()
+        _unzip_pass(fetcher.archive_path)
+        timings["unzip"] = time.perf_counter() - started
+
+        stage = "load"
+        started = time.perf_counter()
+        with open(fetcher.archive_path, "rb") as zip_file:
+            if args.workers > 1:
+                car_rows = iter_car_rows_parallel(zip_file, stats, workers=args.workers)
+            else:
+                car_rows = ingest.iter_car_rows(ingest.iter_csv_rows(zip_file), stats)
+            ingest.parse_and_update_db(_timed(car_rows, timings, "parse"), stats,
+                                       batch_size=args.batch_size, in_place=args.in_place)
+        load_time = time.perf_counter() - started
+        timings["write"] = load_time - timings["parse"]
+        # Окремий прохід розпакування не входить у загальний час конвеєра
+        timings["total"] = timings["download"] + load_time
+    except Exception as e:
+        # Звіт про збій теж результат: видно етап і скільки рядків встигли пройти
+        error = {"stage": stage, "error": f"{type(e).__name__}: {e}".splitlines()[0]}
+
+    report = {
+        "started_at": datetime.datetime.utcnow().isoformat() + "Z",
+        "rows": rows,
+        "database": ingest.engine.dialect.name,
+        "workers": args.workers,
+        "batch_size": args.batch_size,
+        "in_place": args.in_place,
+        "archive_bytes": os.path.getsize(source_path) if os.path.exists(source_path) else None,
+        "stages_sec": {k: round(v, 3) for k, v in timings.items()},
+        "rows_per_sec": round(stats["rows_read"] / load_time, 1) if load_time else None,
+        "peak_rss_mb": _rss_mb(resource.RUSAGE_SELF),
+        "peak_rss_children_mb": _rss_mb(resource.RUSAGE_CHILDREN),
+        "counters": {k: v for k, v in stats.items() if k != "started_at" and not isinstance(v, dict)},
+    }
+    if "delta" in stats:
+        report["delta_summary"] = stats["delta"]
+    if error:
+        report["failed"] = error
+
+    ingest.engine.dispose()
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    if error:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROBE_PATH = "/api/lookup/cache"
+PROBE_INTERVAL = 0.05
+USERS = 20
+PASSWORD = "benchmark-password"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentiles(values):
+    if not values:
+        return {"p50_ms": None, "p99_ms": None, "max_ms": None}
+    values = sorted(values)
+    return {
+        "p50_ms": round(statistics.median(values), 1),
+        "p99_ms": round(values[max(int(len(values) * 0.99) - 1, 0)], 1),
+        "max_ms": round(values[-1], 1),
+    }
+
+
+def _start_server(workers, queue_limit, work_dir):
+    port = _free_port()
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{os.path.join(work_dir, f'bench-{workers}.db')}",
+               SECRET_KEY=os.environ.get("SECRET_KEY", "benchmark"),
+               PASSWORD_WORKERS=str(workers),
+               PYTHONPATH=BACKEND_DIR)
+    if queue_limit:
+        env["PASSWORD_QUEUE_LIMIT"] = str(queue_limit)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(base_url + PROBE_PATH, timeout=1)
+            return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise Exception("Сервер бенчмарку не запустився")
+
+
+async def _run_load(base_url, concurrency, duration):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        for i in range(USERS):
+            await client.post("/auth/signup", json={
+                "email": f"bench{i}@example.com", "password": PASSWORD, "auth_provider": "email",
+            })
+
+        deadline = time.monotonic() + duration
+        logins, rejected, failed, probes = [], 0, 0, []
+
+        async def login_loop(n):
+            nonlocal rejected, failed
+            i = n
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.post("/auth/login", json={
+                    "email": f"bench{i % USERS}@example.com", "password": PASSWORD,
+                })
+                if response.status_code == 200:
+                    logins.append((time.perf_counter() - started) * 1000)
+                elif response.status_code == 503:
+                    rejected += 1
+                    await asyncio.sleep(float(response.headers.get("Retry-After", "1")) / 10)
+                else:
+                    failed += 1
+                i += concurrency
+
+        async def probe_loop():
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                await client.get(PROBE_PATH)
+                probes.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(PROBE_INTERVAL)
+
+        started = time.monotonic()
+        await asyncio.gather(probe_loop(), *(login_loop(n) for n in range(concurrency)))
+        elapsed = time.monotonic() - started
+    return {
+        "logins": len(logins),
+        "rejected": rejected,
+        "failed": failed,
+        "logins_per_sec": round(len(logins) / elapsed, 1),
+        "login_latency": _percentiles(logins),
+        "unrelated_endpoint": dict(_percentiles(probes), requests=len(probes)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк логінів: bcrypt у пулі потоків проти event loop")
+    parser.add_argument("--workers", default="0,4",
+                        help="розміри пулу через кому; 0 - bcrypt прямо в обробнику")
+    parser.add_argument("--queue-limit", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="login-bench-")
+    results = []
+    for workers in (int(w) for w in args.workers.split(",")):
+        process, base_url = _start_server(workers, args.queue_limit, work_dir)
+        try:
+            result = asyncio.run(_run_load(base_url, args.concurrency, args.duration))
+        finally:
+            process.terminate()
+            process.wait()
+        result = dict(workers=workers, **result)
+        results.append(result)
+        print(f"пул {workers}: {result['logins_per_sec']} логінів/с, "
+              f"p99 стороннього запиту {result['unrelated_endpoint']['p99_ms']} мс")
+
+    report = json.dumps({
+        "cpu_count": os.cpu_count(),
+        "concurrency": args.concurrency,
+        "duration_sec": args.duration,
+        "results": results,
+    }, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+
+from app.moderation import ModerationAutomaton, normalize_text
+
+LETTERS = "абвгдежзиіклмнопрстуфхцчшщьюя"
+COMMENT_WORDS = 40
+BASELINE_COMMENTS = 20
+
+
+def _words(count, rng):
+    words = set()
+    while len(words) < count:
+        word = "".join(rng.choice(LETTERS) for _ in range(rng.randint(5, 10)))
+        words.add(word + "*" if rng.random() < 0.3 else word)
+    return sorted(words)
+
+
+def _comments(count, words, rng):
+    comments = []
+    for _ in range(count):
+        text = [("".join(rng.choice(LETTERS) for _ in range(rng.randint(2, 9))))
+                for _ in range(COMMENT_WORDS)]
+        if rng.random() < 0.1:
+            text[rng.randrange(COMMENT_WORDS)] = rng.choice(words).rstrip("*").upper()
+        comments.append(" ".join(text) + "!")
+    return comments
+
+
+def _timings(check, comments):
+    timings = []
+    for comment in comments:
+        started = time.perf_counter()
+        check(comment)
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    timings.sort()
+    return {
+        "p50_us": round(statistics.median(timings), 1),
+        "p99_us": round(timings[int(len(timings) * 0.99) - 1], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк модерації коментарів")
+    parser.add_argument("--patterns", type=int, default=10_000)
+    parser.add_argument("--comments", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = _words(args.patterns, rng)
+    comments = _comments(args.comments, words, rng)
+
+    started = time.perf_counter()
+    automaton = ModerationAutomaton(words)
+    build_ms = (time.perf_counter() - started) * 1000
+    flagged = sum(1 for c in comments if automaton.find(c) is not None)
+
+    # Наївний варіант для порівняння: окремий регулярний вираз на кожне слово
+    regexes = [re.compile(r"\b" + re.escape(w.rstrip("*")) + ("" if w.endswith("*") else r"\b"))
+               for w in words]
+
+    def naive(comment):
+        text = normalize_text(comment)
+        return any(r.search(text) for r in regexes)
+
+    report = json.dumps({
+        "patterns": len(words),
+        "automaton_nodes": len(automaton),
+        "build_ms": round(build_ms, 1),
+        "comments": len(comments),
+        "flagged": flagged,
+        "automaton": _timings(automaton.find, comments),
+        "regex_per_word": _timings(naive, comments[:BASELINE_COMMENTS]),
+    }, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
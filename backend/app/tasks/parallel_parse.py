@@ -0,0 +1,86 @@
+import csv
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from app.tasks.registry_rows import normalize_car_row
+
+CHUNK_SIZE = 32 * 1024 * 1024
+COUNTERS = ("rows_read", "skipped_empty", "skipped_invalid")
+
+
+def extract_newest_csv(zip_file, dest):
+    with zipfile.ZipFile(zip_file) as z:
+        csv_files = [info for info in z.infolist() if info.filename.lower().endswith(".csv")]
+        if not csv_files:
+            raise Exception("У архіві немає CSV файлів")
+        newest_csv = max(csv_files, key=lambda x: x.date_time)
+        print(f"Обрано файл для обробки: {newest_csv.filename}")
+        with z.open(newest_csv) as raw:
+            shutil.copyfileobj(raw, dest, CHUNK_SIZE)
+    dest.flush()
+
+
+def _align_to_line(f, pos):
+    # Рядок належить тому фрагменту, в якому він починається
+    if pos == 0:
+        return 0
+    f.seek(pos - 1)
+    f.readline()
+    return f.tell()
+
+
+def chunk_ranges(size, data_start, chunk_size):
+    return [(start, min(start + chunk_size, size)) for start in range(data_start, size, chunk_size)]
+
+
+def parse_chunk(task):
+    path, fieldnames, start, end = task
+    stats = dict.fromkeys(COUNTERS, 0)
+    with open(path, "rb") as f:
+        start = _align_to_line(f, start)
+        end = _align_to_line(f, end)
+        f.seek(start)
+        data = f.read(end - start)
+
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8"), newline=""),
+                            fieldnames=fieldnames, delimiter=';')
+    car_rows = [car_data for car_data in (normalize_car_row(row, stats) for row in reader) if car_data]
+    return car_rows, stats
+
+
+def iter_car_rows_parallel(zip_file, stats, workers=None, chunk_size=CHUNK_SIZE):
+    workers = workers or os.cpu_count()
+    with tempfile.NamedTemporaryFile(suffix=".csv") as csv_file:
+        extract_newest_csv(zip_file, csv_file)
+        with open(csv_file.name, "rb") as f:
+            header = f.readline()
+            data_start = f.tell()
+        fieldnames = next(csv.reader([header.decode("utf-8")], delimiter=';'))
+        size = os.path.getsize(csv_file.name)
+        tasks = iter(
+            (csv_file.name, fieldnames, start, end)
+            for start, end in chunk_ranges(size, data_start, chunk_size)
+        )
+        print(f"Розбір CSV у {workers} процесах")
+
+        # Обмежене вікно завдань: результати віддаються по порядку і не накопичуються,
+        # якщо запис у БД повільніший за розбір
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(parse_chunk, task))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                car_rows, chunk_stats = pending.popleft().result()
+                task = next(tasks, None)
+                if task is not None:
+                    pending.append(pool.submit(parse_chunk, task))
+                for key in COUNTERS:
+                    stats[key] += chunk_stats[key]
+                print(f"Оброблено {stats['rows_read']} рядків")
+                yield from car_rows
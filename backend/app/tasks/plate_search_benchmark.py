@@ -0,0 +1,103 @@
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from app.tasks.synthetic_registry import iter_registry_rows, parse_row_count
+
+PATTERNS = ["AA12??", "AA1234*", "??12*", "*KX"]
+REPEATS = 50
+FULL_REPEATS = 3
+FULL_PAGE_SIZE = 200
+
+
+def _plates(rows, seed):
+    from app.plates import normalize_plate, is_valid_plate
+    seen = set()
+    for row in iter_registry_rows(rows, seed):
+        plate = normalize_plate(row["N_REG_NEW"])
+        if plate and is_valid_plate(plate) and plate not in seen:
+            seen.add(plate)
+            # Синтетичні VIN не потрібні для пошуку
+            yield {"plate": plate, "vin": None, "make": row["BRAND"],
+                   "model": row["MODEL"], "year": 0, "engine_capacity": row["CAPACITY"]}
+
+
+def _walk_all_pages(search_plates, pattern, db):
+    # LIMIT 50 ховає повний перегляд таблиці на неселективних шаблонах, тож проходимо всі сторінки
+    matches, after = 0, None
+    while True:
+        page = search_plates(pattern=pattern, after=after, limit=FULL_PAGE_SIZE, db=db)
+        matches += len(page.items)
+        if not page.next_cursor:
+            return matches
+        after = page.next_cursor
+
+
+def _populate(engine, Car, rows, seed):
+    from app.tasks.bulk_loader import _iter_batches
+    with engine.begin() as conn:
+        conn.execute(Car.__table__.delete())
+        for batch in _iter_batches(_plates(rows, seed), 50_000):
+            conn.execute(Car.__table__.insert(), batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк пошуку номерів за шаблоном")
+    parser.add_argument("--sizes", default="10k,100k,1m")
+    parser.add_argument("--database-url", default=None,
+                        help="за замовчуванням - тимчасова SQLite база")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="search-bench-")
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(work_dir, 'bench.db')}"
+    from app.db.database import SessionLocal, engine
+    from app.db.models import Base, Car
+    from app.routers.plate_search import search_plates
+    Base.metadata.create_all(bind=engine)
+
+    results = []
+    for size in args.sizes.split(","):
+        rows = parse_row_count(size)
+        _populate(engine, Car, rows, args.seed)
+        db = SessionLocal()
+        try:
+            cars = db.query(Car).count()
+            patterns = {}
+            for pattern in PATTERNS:
+                timings = []
+                for _ in range(REPEATS):
+                    started = time.perf_counter()
+                    page = search_plates(pattern=pattern, after=None, limit=50, db=db)
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                full_timings = []
+                for _ in range(FULL_REPEATS):
+                    started = time.perf_counter()
+                    matches = _walk_all_pages(search_plates, pattern, db)
+                    full_timings.append((time.perf_counter() - started) * 1000)
+                patterns[pattern] = {
+                    "p50_ms": round(statistics.median(timings), 3),
+                    "p99_ms": round(timings[int(len(timings) * 0.99) - 1], 3),
+                    "items": len(page.items),
+                    "all_pages_ms": round(statistics.median(full_timings), 3),
+                    "matches": matches,
+                }
+        finally:
+            db.close()
+        results.append({"rows": rows, "cars": cars, "patterns": patterns})
+        print(f"{cars} номерів: " + ", ".join(f"{p} {v['p50_ms']} мс" for p, v in patterns.items()))
+
+    report = json.dumps({"database": engine.dialect.name, "results": results}, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from email.utils import parsedate_to_datetime
+import requests
+
+STATE_DIR = os.getenv("INGEST_STATE_DIR", os.path.dirname(os.path.abspath(__file__)))
+STATE_FILE = "file_info.json"
+ARCHIVE_FILE = "registry.zip"
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT = 60
+
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+def _fsync_write(path, data):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def _expected_size(response, offset):
+    if response.status_code == 206:
+        match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+        if match and match.group(3) != "*":
+            return int(match.group(3))
+        return None
+    length = response.headers.get("Content-Length")
+    return offset + int(length) if length is not None else None
+
+
+class RegistryFetcher:
+    def __init__(self, url, state_dir=None, session=None, expected_sha256=None):
+        self.url = url
+        self.state_dir = state_dir or STATE_DIR
+        self.session = session or requests.Session()
+        self.expected_sha256 = expected_sha256 or os.getenv("REGISTRY_SHA256")
+        self.state_path = os.path.join(self.state_dir, STATE_FILE)
+        self.archive_path = os.path.join(self.state_dir, ARCHIVE_FILE)
+        self.part_path = self.archive_path + ".part"
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r") as f:
+            state = json.load(f)
+        # Старий формат file_info.json зберігався лише після успішного імпорту
+        state.setdefault("imported", True)
+        return state
+
+    def save_state(self, state):
+        os.makedirs(self.state_dir, exist_ok=True)
+        _fsync_write(self.state_path, json.dumps(state))
+
+    def snapshot_at(self):
+        last_modified = self.load_state().get("last_modified")
+        return parsedate_to_datetime(last_modified) if last_modified else None
+
+    def mark_imported(self):
+        state = self.load_state()
+        state["imported"] = True
+        self.save_state(state)
+
+    def _request_headers(self, state, conditional, offset):
+        headers = {"Accept-Encoding": "identity"}
+        # Невдалий імпорт залишає перевірений архів, який можна не завантажувати вдруге
+        have_archive = state.get("imported") or (
+            state.get("sha256") and os.path.exists(self.archive_path)
+        )
+        if conditional and have_archive:
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+        partial = state.get("partial") or {}
+        validator = partial.get("etag") or partial.get("last_modified")
+        if offset and validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        return headers
+
+    def fetch(self, conditional=True):
+        state = self.load_state()
+        offset = os.path.getsize(self.part_path) if os.path.exists(self.part_path) else 0
+        headers = self._request_headers(state, conditional, offset)
+
+        with self.session.get(self.url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+            if response.status_code == 304:
+                if not state.get("imported"):
+                    print("ℹВикористовується раніше завантажений архів.")
+                    return True
+                print("ℹФайл не змінювався з останнього імпорту.")
+                return False
+            if response.status_code == 416:
+                os.unlink(self.part_path)
+                return self.fetch(conditional)
+            response.raise_for_status()
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            state["partial"] = {"etag": etag, "last_modified": last_modified}
+            self.save_state(state)
+
+            hasher = hashlib.sha256()
+            if response.status_code == 206:
+                print(f"Продовження завантаження з {offset} байт")
+                with open(self.part_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                        hasher.update(chunk)
+                mode = "ab"
+            else:
+                print("Завантаження архіву")
+                offset = 0
+                mode = "wb"
+
+            expected_size = _expected_size(response, offset)
+            with open(self.part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        hasher.update(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+        size = os.path.getsize(self.part_path)
+        if expected_size is not None and size != expected_size:
+            raise Exception(f"Архів завантажено не повністю: {size} з {expected_size} байт")
+
+        sha256 = hasher.hexdigest()
+        if self.expected_sha256 and sha256 != self.expected_sha256:
+            os.unlink(self.part_path)
+            raise Exception(f"Контрольна сума архіву не збігається: {sha256}")
+        os.replace(self.part_path, self.archive_path)
+
+        unchanged = conditional and state.get("imported") and state.get("sha256") == sha256
+        state = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": sha256,
+            "size": size,
+            "imported": bool(unchanged),
+        }
+        self.save_state(state)
+        if unchanged:
+            print("ℹВміст архіву не змінився, хоча сервер віддав нову версію.")
+            return False
+        return True
@@ -0,0 +1,28 @@
+from app.plates import normalize_plate, is_valid_plate
+from app.catalog import catalog_key
+from app.tasks.delta_ingest import fingerprint_row
+
+def normalize_car_row(row, stats):
+    stats["rows_read"] += 1
+    plate = normalize_plate(row.get("N_REG_NEW") or "")
+    if not plate:
+        stats["skipped_empty"] += 1
+        return None
+    if not is_valid_plate(plate):
+        stats["skipped_invalid"] += 1
+        return None
+
+    make_year = (row.get("MAKE_YEAR") or "").strip()
+    car_data = {
+        "plate": plate,
+        "vin": (row.get("VIN") or "").strip(),
+        "make": (row.get("BRAND") or "").strip(),
+        "model": (row.get("MODEL") or "").strip(),
+        "year": int(make_year) if make_year.isdigit() else 0,
+        "engine_capacity": (row.get("CAPACITY") or "").strip()
+    }
+    car_data["make_key"] = catalog_key(car_data["make"])
+    car_data["model_key"] = catalog_key(car_data["model"])
+    car_data["region"] = plate[:2]
+    car_data["fingerprint"] = fingerprint_row(car_data)
+    return car_data
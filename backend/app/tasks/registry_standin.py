@@ -0,0 +1,100 @@
+import os
+import re
+import threading
+from contextlib import contextmanager
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+
+class RegistryStandInHandler(BaseHTTPRequestHandler):
+    # Локальна заміна data.gov.ua: ETag, Last-Modified, умовні запити та Range
+    file_path = None
+    etag = None
+    last_modified = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _not_modified(self):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return if_none_match == self.etag
+        return self.headers.get("If-Modified-Since") == self.last_modified
+
+    def _requested_range(self, size):
+        match = _RANGE.match(self.headers.get("Range", ""))
+        if not match:
+            return None
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range not in (self.etag, self.last_modified):
+            return None
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+        return start, min(end, size - 1)
+
+    def _send_headers(self):
+        size = os.path.getsize(self.file_path)
+        if self._not_modified():
+            self.send_response(304)
+            self.send_header("ETag", self.etag)
+            self.end_headers()
+            return None
+
+        byte_range = self._requested_range(size)
+        if byte_range and byte_range[0] >= size:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.end_headers()
+            return None
+
+        start, end = byte_range or (0, size - 1)
+        if byte_range:
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", self.etag)
+        self.send_header("Last-Modified", self.last_modified)
+        self.end_headers()
+        return start, end
+
+    def do_HEAD(self):
+        self._send_headers()
+
+    def do_GET(self):
+        byte_range = self._send_headers()
+        if byte_range is None:
+            return
+        start, end = byte_range
+        with open(self.file_path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(remaining, 1024 * 1024))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+
+@contextmanager
+def serve_registry(file_path, host="127.0.0.1", port=0):
+    stat = os.stat(file_path)
+    handler = type("Handler", (RegistryStandInHandler,), {
+        "file_path": file_path,
+        "etag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+        "last_modified": formatdate(stat.st_mtime, usegmt=True),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_port}/{os.path.basename(file_path)}"
+    finally:
+        server.shutdown()
+        server.server_close()
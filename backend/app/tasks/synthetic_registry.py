@@ -0,0 +1,131 @@
+import argparse
+import csv
+import io
+import random
+import zipfile
+
+COLUMNS = [
+    "PERSON", "REG_ADDR_KOATUU", "OPER_CODE", "OPER_NAME", "D_REG", "DEP_CODE", "DEP",
+    "BRAND", "MODEL", "VIN", "MAKE_YEAR", "COLOR", "KIND", "BODY", "PURPOSE", "FUEL",
+    "CAPACITY", "OWN_WEIGHT", "TOTAL_WEIGHT", "N_REG_NEW",
+]
+
+REGIONS = ["АА", "КА", "ВС", "АХ", "ВІ", "АЕ", "ВН", "АІ", "ВО", "СА", "АТ", "ВК", "ІІ", "ХО"]
+PLATE_LETTERS = "АВЕІКМНОРСТХ"
+LATIN_LETTERS = "ABCEHIKMOPTX"
+VIN_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+CATALOG = {
+    "TOYOTA": ["CAMRY", "COROLLA", "RAV4", "LAND CRUISER"],
+    "VOLKSWAGEN": ["GOLF", "PASSAT", "TIGUAN", "JETTA"],
+    "RENAULT": ["MEGANE", "LOGAN", "DUSTER"],
+    "SKODA": ["OCTAVIA", "FABIA", "SUPERB"],
+    "ВАЗ": ["2107", "2110", "LADA PRIORA"],
+    "DAEWOO": ["LANOS", "SENS", "MATIZ"],
+    "BMW": ["X5", "320I", "520D"],
+    "HYUNDAI": ["TUCSON", "ACCENT", "ELANTRA"],
+}
+COLORS = ["БІЛИЙ", "ЧОРНИЙ", "СІРИЙ", "СИНІЙ", "ЧЕРВОНИЙ"]
+FUELS = ["БЕНЗИН", "ДИЗЕЛЬНЕ ПАЛИВО", "ЕЛЕКТРО", "БЕНЗИН АБО ГАЗ"]
+
+EMPTY_SHARE = 0.02
+INVALID_SHARE = 0.01
+DUPLICATE_SHARE = 0.03
+LATIN_SHARE = 0.10
+RECENT_PLATES = 10_000
+
+
+def parse_row_count(value):
+    suffixes = {"k": 1_000, "m": 1_000_000}
+    value = value.strip().lower()
+    if value[-1:] in suffixes:
+        return int(float(value[:-1]) * suffixes[value[-1]])
+    return int(value)
+
+
+def _plate(rng):
+    digits = f"{rng.randrange(10000):04d}"
+    if rng.random() < LATIN_SHARE:
+        return "".join(rng.choice(LATIN_LETTERS) for _ in range(2)) + digits + \
+            "".join(rng.choice(LATIN_LETTERS) for _ in range(2))
+    return rng.choice(REGIONS) + digits + "".join(rng.choice(PLATE_LETTERS) for _ in range(2))
+
+
+def _invalid_plate(rng):
+    return rng.choice([
+        f"{rng.randrange(100000):05d}АА",
+        "Т" + f"{rng.randrange(10000):04d}" + "ВК",
+        "АА" + f"{rng.randrange(100000):05d}" + "ВК",
+        "ТРАНЗИТ",
+    ])
+
+
+def iter_registry_rows(rows, seed=0):
+    rng = random.Random(seed)
+    recent = []
+    brands = list(CATALOG)
+    for i in range(rows):
+        roll = rng.random()
+        if roll < EMPTY_SHARE:
+            plate = ""
+        elif roll < EMPTY_SHARE + INVALID_SHARE:
+            plate = _invalid_plate(rng)
+        elif roll < EMPTY_SHARE + INVALID_SHARE + DUPLICATE_SHARE and recent:
+            plate = rng.choice(recent)
+        else:
+            plate = _plate(rng)
+            if len(recent) < RECENT_PLATES:
+                recent.append(plate)
+            else:
+                recent[rng.randrange(RECENT_PLATES)] = plate
+
+        brand = rng.choice(brands)
+        fuel = rng.choice(FUELS)
+        yield {
+            "PERSON": rng.choice(["P", "J"]),
+            "REG_ADDR_KOATUU": str(rng.randrange(100000000, 9999999999)),
+            "OPER_CODE": str(rng.choice([100, 308, 315, 440])),
+            "OPER_NAME": "ПЕРЕРЕЄСТРАЦІЯ НА НОВОГО ВЛАСНИКА",
+            "D_REG": f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            "DEP_CODE": str(rng.randrange(12000, 12999)),
+            "DEP": "ТСЦ МВС",
+            "BRAND": brand,
+            "MODEL": rng.choice(CATALOG[brand]),
+            "VIN": "" if rng.random() < 0.05 else "".join(rng.choice(VIN_CHARS) for _ in range(17)),
+            "MAKE_YEAR": "" if rng.random() < 0.01 else str(rng.randrange(1980, 2026)),
+            "COLOR": rng.choice(COLORS),
+            "KIND": "ЛЕГКОВИЙ",
+            "BODY": "СЕДАН",
+            "PURPOSE": "ЗАГАЛЬНИЙ",
+            "FUEL": fuel,
+            "CAPACITY": "" if fuel == "ЕЛЕКТРО" else str(rng.choice([998, 1398, 1598, 1968, 2494, 2998])),
+            "OWN_WEIGHT": str(rng.randrange(900, 2500)),
+            "TOTAL_WEIGHT": str(rng.randrange(1300, 3200)),
+            "N_REG_NEW": plate,
+        }
+
+
+def write_registry_zip(path, rows, seed=0, member_name="reestrtz_synthetic.csv"):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        with z.open(member_name, "w", force_zip64=True) as raw:
+            stream = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            writer = csv.DictWriter(stream, fieldnames=COLUMNS, delimiter=';')
+            writer.writeheader()
+            for row in iter_registry_rows(rows, seed):
+                writer.writerow(row)
+            stream.flush()
+            stream.detach()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерація синтетичного реєстру у форматі reestrtz")
+    parser.add_argument("output")
+    parser.add_argument("--rows", default="10k", help="кількість рядків: 10k, 1m, 10m або число")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_registry_zip(args.output, parse_row_count(args.rows), args.seed)
+    print(f"Створено {args.output}")
+
+
+if __name__ == "__main__":
+    main()
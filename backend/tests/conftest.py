@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Файлова база, щоб синхронний і асинхронний engine бачили ті самі таблиці
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='carinfo-tests-'), 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test")
@@ -0,0 +1,27 @@
+from sqlalchemy import create_engine, text
+from app.db.models import Base
+from app.tasks.bulk_loader import BulkLoader
+from app.tasks.download_and_update import new_ingest_stats
+from app.tasks.registry_rows import normalize_car_row
+
+
+def _rows(registry, stats):
+    return [normalize_car_row({"N_REG_NEW": plate, "VIN": vin, "BRAND": "Toyota", "MODEL": "Camry",
+                               "MAKE_YEAR": "2015", "CAPACITY": "2000"}, stats)
+            for plate, vin in registry]
+
+
+def test_in_place_load_accepts_empty_and_reregistered_vins(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cars.db'}")
+    Base.metadata.create_all(engine)
+    loader = BulkLoader(engine)
+    # Порожні VIN і той самий VIN, перереєстрований на інший номер, як у реальному реєстрі
+    registry = [("AA1111AA", ""), ("AA2222AA", ""), ("BB1111BB", "JT123"), ("CC1111CC", "JT123")]
+    stats = new_ingest_stats()
+    loader.load(_rows(registry, stats), stats)
+    stats = new_ingest_stats()
+    loader.load(_rows(registry + [("DD1111DD", "JT123")], stats), stats)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT plate, vin FROM cars ORDER BY plate")).all()
+    assert rows == registry + [("DD1111DD", "JT123")]
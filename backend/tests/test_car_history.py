@@ -0,0 +1,112 @@
+import datetime
+import pytest
+from sqlalchemy import create_engine, text
+from app.db.models import CarFingerprint, CarHistory
+from app.tasks.bulk_loader import STAGING_TABLE, BulkLoader
+from app.tasks.compact_history import compact
+from app.tasks.delta_ingest import apply_delta, fingerprint_row
+
+# car_history до міграції: повний знімок реєстру на кожен імпорт
+LEGACY_HISTORY = (
+    "CREATE TABLE car_history (id INTEGER PRIMARY KEY, plate VARCHAR, vin VARCHAR, make VARCHAR, "
+    "model VARCHAR, year INTEGER, engine_capacity VARCHAR, created_at DATETIME)"
+)
+SNAPSHOTS = ("2024-01-01 00:00:00", "2024-02-01 00:00:00", "2024-03-01 00:00:00")
+CAMRY = ("VIN1", "Toyota", "Camry", 2015, "2000")
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+
+
+@pytest.fixture
+def legacy(engine):
+    registry = {
+        # Той самий стан у кожному знімку - один відкритий інтервал
+        "AA1111AA": [CAMRY, CAMRY, CAMRY],
+        # Змінився власник/VIN у третьому знімку
+        "BB2222BB": [CAMRY, CAMRY, ("VIN2",) + CAMRY[1:]],
+        # Зник із реєстру в третьому знімку
+        "CC3333CC": [CAMRY, CAMRY, None],
+    }
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_HISTORY))
+        for plate, states in registry.items():
+            for created_at, state in zip(SNAPSHOTS, states):
+                if state is not None:
+                    conn.execute(text(
+                        "INSERT INTO car_history (plate, vin, make, model, year, engine_capacity, created_at) "
+                        "VALUES (:plate, :vin, :make, :model, :year, :engine_capacity, :created_at)"
+                    ), dict(zip(("vin", "make", "model", "year", "engine_capacity"), state),
+                            plate=plate, created_at=created_at))
+    return engine
+
+
+def _intervals(conn):
+    return conn.execute(text(
+        "SELECT plate, vin, valid_from, valid_to FROM car_history ORDER BY plate, valid_from"
+    )).all()
+
+
+def test_compact_collapses_repeated_snapshots(legacy):
+    assert compact(legacy) == 4
+    with legacy.connect() as conn:
+        intervals = _intervals(conn)
+        fingerprints = dict(conn.execute(text("SELECT plate, fingerprint FROM car_fingerprints")).all())
+    assert intervals == [
+        ("AA1111AA", "VIN1", SNAPSHOTS[0], None),
+        ("BB2222BB", "VIN1", SNAPSHOTS[0], SNAPSHOTS[2]),
+        ("BB2222BB", "VIN2", SNAPSHOTS[2], None),
+        ("CC3333CC", "VIN1", SNAPSHOTS[0], SNAPSHOTS[2]),
+    ]
+    # Відбитки лише для відкритих інтервалів, щоб наступний --delta імпорт мав з чим порівнювати
+    assert set(fingerprints) == {"AA1111AA", "BB2222BB"}
+
+
+def test_dry_run_leaves_history_untouched(legacy):
+    assert compact(legacy, dry_run=True) == 4
+    with legacy.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM car_history")).scalar() == 8
+        assert "created_at" in conn.execute(text("SELECT * FROM car_history")).keys()
+
+
+def _stage(engine, rows):
+    loader = BulkLoader(engine)
+    with engine.begin() as conn:
+        loader.create_staging(conn)
+        for seq, row in enumerate(rows):
+            row = dict(row, make_key="", model_key="", region=row["plate"][:2], seq=seq)
+            row["fingerprint"] = fingerprint_row(row)
+            conn.execute(text(
+                f"INSERT INTO {STAGING_TABLE} (plate, vin, make, model, year, engine_capacity, "
+                f"make_key, model_key, region, fingerprint, seq) VALUES (:plate, :vin, :make, :model, "
+                f":year, :engine_capacity, :make_key, :model_key, :region, :fingerprint, :seq)"
+            ), row)
+
+
+def _car(plate, vin):
+    return {"plate": plate, "vin": vin, "make": "Toyota", "model": "Camry", "year": 2015,
+            "engine_capacity": "2000"}
+
+
+def test_apply_delta_closes_old_interval_and_opens_new(engine):
+    CarHistory.__table__.create(engine)
+    CarFingerprint.__table__.create(engine)
+    first = datetime.datetime(2024, 1, 1)
+    second = datetime.datetime(2024, 2, 1)
+
+    _stage(engine, [_car("AA1111AA", "VIN1"), _car("BB2222BB", "VIN1")])
+    with engine.begin() as conn:
+        assert apply_delta(conn, STAGING_TABLE, first) == {"new": 2, "changed": 0, "removed": 0}
+    _stage(engine, [_car("AA1111AA", "VIN2")])
+    with engine.begin() as conn:
+        assert apply_delta(conn, STAGING_TABLE, second) == {"new": 0, "changed": 1, "removed": 1}
+        intervals = [(plate, vin, valid_from[:10], valid_to and valid_to[:10])
+                     for plate, vin, valid_from, valid_to in _intervals(conn)]
+
+    assert intervals == [
+        ("AA1111AA", "VIN1", "2024-01-01", "2024-02-01"),
+        ("AA1111AA", "VIN2", "2024-02-01", None),
+        ("BB2222BB", "VIN1", "2024-01-01", "2024-02-01"),
+    ]
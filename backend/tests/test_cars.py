@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.db.database import engine
+from app.db.models import Car
+from app.cursors import encode_cursor
+from app.main import app
+
+PLATES = ["AA1111AA", "BB2222BB", "ЯЯ9999ЯЮ"]
+
+
+@pytest.fixture(scope="module")
+def client():
+    with engine.begin() as conn:
+        conn.execute(Car.__table__.delete().where(Car.make_key == "pagetest"))
+        conn.execute(Car.__table__.insert(), [
+            {"plate": plate, "make": "PageTest", "model": "Camry", "make_key": "pagetest",
+             "model_key": "camry", "region": plate[:2]}
+            for plate in PLATES
+        ])
+    return TestClient(app)
+
+
+def _walk(client, path):
+    plates, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"after": cursor} if cursor else {})}
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        plates += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return plates, response
+
+
+def test_pages_walk_through_cyrillic_plates(client):
+    plates, _ = _walk(client, "/cars/pagetest/camry/plates")
+    assert plates == PLATES
+
+
+def test_page_after_last_plate_is_empty(client):
+    # Клієнт, який тримає курсор останнього номера, повинен отримати порожню сторінку, а не 404
+    cursor = encode_cursor(PLATES[-1])
+    last = client.get("/cars/pagetest/camry/plates", params={"limit": 1, "after": cursor})
+    assert last.status_code == 200
+    assert last.json() == []
+    assert "X-Next-Cursor" not in last.headers
+
+    grouped = client.get("/cars/pagetest/camry/plates/grouped", params={"after": cursor})
+    assert grouped.status_code == 200
+    assert grouped.json() == {}
+
+
+def test_unknown_model_is_still_not_found(client):
+    assert client.get("/cars/pagetest/unknown/plates").status_code == 404
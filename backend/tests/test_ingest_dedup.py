@@ -0,0 +1,31 @@
+from sqlalchemy import create_engine, text
+from app.db.models import Base
+from app.tasks.bulk_loader import BulkLoader
+from app.tasks.download_and_update import iter_car_rows, new_ingest_stats
+
+CSV_ROWS = [
+    {"N_REG_NEW": "AA1111AA", "VIN": "FIRST", "BRAND": "Toyota", "MODEL": "Camry", "MAKE_YEAR": "2015"},
+    {"N_REG_NEW": "BB2222BB", "VIN": "OTHER", "BRAND": "BMW", "MODEL": "X5", "MAKE_YEAR": "2018"},
+    {"N_REG_NEW": "аа1111аа", "VIN": "SECOND", "BRAND": "Toyota", "MODEL": "Camry", "MAKE_YEAR": "2016"},
+]
+
+
+def test_row_stream_keeps_no_per_plate_state():
+    # Генератор не пам'ятає побачених номерів: пам'ять не росте з розміром реєстру
+    stats = new_ingest_stats()
+    rows = list(iter_car_rows(iter(CSV_ROWS), stats))
+    assert [r["plate"] for r in rows] == ["AA1111AA", "BB2222BB", "AA1111AA"]
+    assert stats["skipped_duplicates_csv"] == 0
+
+
+def test_staging_keeps_first_occurrence_of_plate(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cars.db'}")
+    Base.metadata.create_all(engine)
+    stats = new_ingest_stats()
+    BulkLoader(engine).load(iter_car_rows(iter(CSV_ROWS), stats), stats)
+
+    with engine.connect() as conn:
+        cars = conn.execute(text("SELECT plate, vin FROM cars ORDER BY plate")).all()
+    assert cars == [("AA1111AA", "FIRST"), ("BB2222BB", "OTHER")]
+    assert stats["skipped_duplicates_csv"] == 1
+    assert stats["rows_written"] == 2
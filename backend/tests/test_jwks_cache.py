@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi.testclient import TestClient
+from jwt.algorithms import RSAAlgorithm
+from jwt.exceptions import PyJWKError
+from app.auth import apple_auth, routes_apple
+from app.auth.jwks_cache import JwksCache, JwksUnavailable
+from app.auth.jwks_standin import JwksStandIn, serve_jwks
+
+
+def _jwk(kid):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    data = json.loads(RSAAlgorithm.to_jwk(key.public_key()))
+    data.update(kid=kid, alg="RS256", use="sig")
+    return data
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return {kid: _jwk(kid) for kid in ("a", "b")}
+
+
+@pytest.fixture
+def cache_for():
+    caches = []
+
+    def make(url, **kwargs):
+        cache = JwksCache(url, **kwargs)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        cache.stop()
+
+
+def test_concurrent_misses_share_one_fetch(keys, cache_for):
+    standin = JwksStandIn([keys["a"]])
+    standin.delay = 0.2
+    with serve_jwks(standin) as url:
+        cache = cache_for(url)
+        threads = [threading.Thread(target=cache.get_signing_key, args=("a",)) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert standin.requests == 1
+
+
+def test_unknown_kid_refetches_once_per_interval(keys, cache_for):
+    standin = JwksStandIn([keys["a"]])
+    with serve_jwks(standin) as url:
+        cache = cache_for(url, min_refetch_interval=60)
+        cache.get_signing_key("a")
+        for _ in range(5):
+            with pytest.raises(PyJWKError):
+                cache.get_signing_key("unknown")
+        assert standin.requests == 2
+
+        # Ротація в межах інтервалу: новий kid з'явиться після наступного дозволеного запиту
+        standin.rotate([keys["a"], keys["b"]])
+        cache._missed_at -= 60
+        assert cache.get_signing_key("b") is not None
+        assert standin.requests == 3
+
+
+def test_empty_cache_with_standin_down_is_unavailable(keys, cache_for):
+    standin = JwksStandIn([keys["a"]])
+    standin.fail()
+    with serve_jwks(standin) as url:
+        cache = cache_for(url, min_refetch_interval=60)
+        for _ in range(5):
+            with pytest.raises(JwksUnavailable):
+                cache.get_signing_key("a")
+    assert standin.requests == 1
+
+
+def test_apple_login_returns_503_while_keys_unavailable(keys, cache_for, monkeypatch):
+    from app.main import app
+    standin = JwksStandIn([keys["a"]])
+    standin.fail()
+    with serve_jwks(standin) as url:
+        cache = cache_for(url, min_refetch_interval=60)
+        monkeypatch.setattr(apple_auth, "apple_jwks", cache)
+        monkeypatch.setattr(routes_apple, "apple_jwks", cache)
+        token = jwt.encode({"sub": "x"}, "k" * 32, algorithm="HS256", headers={"kid": "a"})
+        response = TestClient(app).post("/auth/apple", json={"identity_token": token})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "60"
+
+
+def test_warm_cache_serves_stale_keys_while_standin_down(keys, cache_for):
+    standin = JwksStandIn([keys["a"]], max_age=0)
+    with serve_jwks(standin) as url:
+        cache = cache_for(url, ttl=0.05, retry_interval=0.05)
+        key = cache.get_signing_key("a")
+        standin.fail()
+        # Фонове оновлення на 80% max-age падає, але вже завантажені ключі лишаються
+        time.sleep(0.3)
+        assert cache.failures > 0
+        assert cache.get_signing_key("a") is key
@@ -0,0 +1,25 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.db.database import engine
+from app.db.models import Car
+from app.main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with engine.begin() as conn:
+        conn.execute(Car.__table__.delete().where(Car.plate == "KA1234AB"))
+        conn.execute(Car.__table__.insert(), [{
+            "plate": "KA1234AB", "vin": "VIN1", "make": "Toyota", "model": "Camry",
+            "year": 2015, "engine_capacity": "2000",
+        }])
+    return TestClient(app)
+
+
+def test_results_are_keyed_by_input(client):
+    # Кирилиця, нижній регістр і пробіли нормалізуються до того самого номера
+    inputs = ["ка1234ав", " KA1234AB ", "KA1234AB", "XX0000XX", ""]
+    body = client.post("/api/lookup/batch", json={"plates": inputs}).json()
+    assert set(body["found"]) == {"ка1234ав", " KA1234AB ", "KA1234AB"}
+    assert body["found"]["ка1234ав"]["vin"] == "VIN1"
+    assert body["missing"] == ["XX0000XX", ""]
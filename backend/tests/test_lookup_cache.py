@@ -0,0 +1,95 @@
+import datetime
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.dataset_meta import DatasetMeta
+from app.db.models import Base, DatasetGeneration
+from app.lookup_cache import MISSING, LookupCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'meta.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _activate(db, generation_id):
+    db.query(DatasetGeneration).filter(DatasetGeneration.status == "active").update({"status": "previous"})
+    db.add(DatasetGeneration(id=generation_id, status="active", activated_at=datetime.datetime.utcnow()))
+    db.commit()
+
+
+def _cache(clock, meta=None):
+    return LookupCache(ttl=600, negative_ttl=60, meta=meta or DatasetMeta(clock=clock), clock=clock)
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = _cache(clock)
+    cache.put("AA1234BB", {"make": "Toyota"})
+    clock.advance(599)
+    assert cache.get("AA1234BB") == {"make": "Toyota"}
+    clock.advance(1)
+    assert cache.get("AA1234BB") is MISSING
+
+
+def test_negative_entry_uses_shorter_ttl(clock):
+    cache = _cache(clock)
+    cache.put("AA1234BB", {"make": "Toyota"})
+    cache.put("XX0000XX", None)
+    clock.advance(59)
+    assert cache.get("XX0000XX") is None
+    clock.advance(1)
+    assert cache.get("XX0000XX") is MISSING
+    assert cache.get("AA1234BB") == {"make": "Toyota"}
+
+
+def test_new_generation_clears_cache_after_check_interval(clock, db):
+    meta = DatasetMeta(check_interval=5, clock=clock)
+    cache = _cache(clock, meta)
+    _activate(db, 1)
+    cache.sync_generation(db)
+    cache.put("AA1234BB", {"make": "Toyota"})
+
+    _activate(db, 2)
+    cache.sync_generation(db)
+    # Покоління перевіряється не частіше ніж раз на check_interval
+    assert cache.get("AA1234BB") == {"make": "Toyota"}
+
+    clock.advance(5)
+    cache.sync_generation(db)
+    assert cache.get("AA1234BB") is MISSING
+    assert cache.stats()["generation"] == 2
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_rollback_to_previous_generation_clears_cache(clock, db):
+    meta = DatasetMeta(check_interval=0, clock=clock)
+    cache = _cache(clock, meta)
+    _activate(db, 1)
+    _activate(db, 2)
+    cache.sync_generation(db)
+    cache.put("AA1234BB", {"make": "Toyota"})
+
+    db.query(DatasetGeneration).filter(DatasetGeneration.id == 2).update({"status": "rolled_back"})
+    db.query(DatasetGeneration).filter(DatasetGeneration.id == 1).update({"status": "active"})
+    db.commit()
+    cache.sync_generation(db)
+    assert cache.get("AA1234BB") is MISSING
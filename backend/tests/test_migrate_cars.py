@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from app.tasks.migrate_cars import migrate
+
+# Схема cars до появи каталогу, як на розгорнутій базі
+LEGACY_CARS = (
+    "CREATE TABLE cars (id INTEGER PRIMARY KEY, vin VARCHAR, plate VARCHAR, make VARCHAR, "
+    "model VARCHAR, year INTEGER, engine_capacity VARCHAR)",
+    "CREATE UNIQUE INDEX ix_cars_vin ON cars (vin)",
+    "CREATE INDEX ix_cars_plate ON cars (plate)",
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cars.db'}")
+    with engine.begin() as conn:
+        for statement in LEGACY_CARS:
+            conn.execute(text(statement))
+        conn.execute(text(
+            "INSERT INTO cars (plate, make, model) VALUES "
+            "('AA1111AA', 'Toyota', 'Camry'), ('AA2222AA', 'TOYOTA ', 'camry'), ('BB1111BB', NULL, NULL)"
+        ))
+    return engine
+
+
+def test_migrate_backfills_catalog_keys(engine):
+    migrate(engine)
+    migrate(engine)
+    with engine.connect() as conn:
+        keys = dict(conn.execute(text("SELECT plate, make_key || '/' || model_key FROM cars")).all())
+        makes = conn.execute(text("SELECT key, cars, models FROM car_makes")).all()
+        indexes = {i["name"] for i in inspect(conn).get_indexes("cars")}
+    assert keys == {"AA1111AA": "toyota/camry", "AA2222AA": "toyota/camry", "BB1111BB": "/"}
+    assert makes == [("toyota", 2, 1)]
+    assert "ix_cars_make_model_plate" in indexes
+
+
+def test_migrate_backfills_region(engine):
+    migrate(engine)
+    with engine.connect() as conn:
+        regions = dict(conn.execute(text("SELECT plate, region FROM cars")).all())
+        indexes = {i["name"] for i in inspect(conn).get_indexes("cars")}
+    assert regions == {"AA1111AA": "AA", "AA2222AA": "AA", "BB1111BB": "BB"}
+    assert "ix_cars_make_model_region" in indexes
+
+
+def test_migrate_relaxes_vin_and_enforces_plate(engine):
+    migrate(engine)
+    migrate(engine)
+    with engine.connect() as conn:
+        unique = {i["name"]: i["unique"] for i in inspect(conn).get_indexes("cars")}
+    assert not unique["ix_cars_vin"]
+    assert unique["ix_cars_plate"]
+
+
+def test_migrate_creates_digits_index(engine):
+    migrate(engine)
+    with engine.connect() as conn:
+        # Індекси на виразах SQLAlchemy для SQLite не відображає
+        sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'ix_cars_plate_digits'")).scalar()
+    assert "substr(plate, 3, 4)" in sql
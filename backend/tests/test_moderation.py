@@ -0,0 +1,11 @@
+from app.moderation import contains_profanity, normalize_text
+
+
+def test_punctuation_between_words_is_a_boundary():
+    assert normalize_text("ти,дурень") == "ти дурень"
+    assert contains_profanity("ти,дурень")
+
+
+def test_separators_inside_word_are_removed():
+    assert normalize_text("д.у.р.е.н.ь") == "дурень"
+    assert contains_profanity("ти д.у.р.е.н.ь!")
@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine, select
+from app.db.models import Base, Car
+from app.routers.plate_search import PLATE_DIGITS, build_plate_filters
+
+
+def _filters(pattern):
+    return [str(f.compile(compile_kwargs={"literal_binds": True}))
+            for f in build_plate_filters(pattern, Car.plate, PLATE_DIGITS)]
+
+
+def test_trailing_star_keeps_digits_range():
+    filters = _filters("??12*")
+    assert "substr(cars.plate, 3, 4) >= '12'" in filters
+    assert "substr(cars.plate, 3, 4) < '13'" in filters
+
+
+def test_star_before_digits_disables_digits_range():
+    assert not any("substr" in f for f in _filters("?*12*"))
+
+
+def test_digits_range_uses_expression_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cars.db'}")
+    Base.metadata.create_all(engine)
+    query = select(Car.plate).where(*build_plate_filters("??12*", Car.plate, PLATE_DIGITS))
+    compiled = query.compile(engine)
+    with engine.connect() as conn:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    assert any("USING INDEX ix_cars_plate_digits" in row[-1] for row in plan), plan
@@ -0,0 +1,98 @@
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from app.auth import routes_apple
+from app.auth.oauth import create_access_token
+from app.auth.principal_cache import Principal, PrincipalCache, principal_cache
+from app.db.database import SessionLocal
+from app.db.models import User
+from app.main import app
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+PRINCIPAL = Principal(id=1, email="a@b.c", name=None, bio=None, auth_provider="email")
+
+
+def test_entry_expires_after_ttl():
+    clock = Clock()
+    cache = PrincipalCache(ttl=60, clock=clock)
+    cache.put(1, "token", PRINCIPAL)
+    clock.advance(59)
+    assert cache.get(1, "token") is PRINCIPAL
+    clock.advance(1)
+    assert cache.get(1, "token") is None
+
+
+def test_entry_never_outlives_token():
+    clock = Clock()
+    cache = PrincipalCache(ttl=60, clock=clock)
+    cache.put(1, "token", PRINCIPAL, expires_in=10)
+    clock.advance(10)
+    assert cache.get(1, "token") is None
+    cache.put(1, "expired", PRINCIPAL, expires_in=0)
+    assert cache.get(1, "expired") is None
+
+
+def test_invalidate_drops_every_token_of_user():
+    cache = PrincipalCache(ttl=60, clock=Clock())
+    cache.put(1, "phone", PRINCIPAL)
+    cache.put(1, "laptop", PRINCIPAL)
+    cache.put(2, "other", PRINCIPAL)
+    cache.invalidate(1)
+    assert cache.get(1, "phone") is None
+    assert cache.get(1, "laptop") is None
+    assert cache.get(2, "other") is PRINCIPAL
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def user():
+    with SessionLocal() as db:
+        user = User(email=f"{uuid.uuid4().hex}@example.com", auth_provider="email")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        return user
+
+
+def _auth(user):
+    token = create_access_token(user_id=str(user.id), token_type="access", auth_provider=user.auth_provider)
+    return token, {"Authorization": f"Bearer {token}"}
+
+
+def test_profile_update_invalidates_cached_principal(client, user):
+    token, headers = _auth(user)
+    assert client.get("/user/me", headers=headers).status_code == 200
+    assert principal_cache.get(user.id, token).name is None
+
+    client.put("/user/update", json={"name": "Оновлене ім'я"}, headers=headers)
+    assert principal_cache.get(user.id, token) is None
+    client.get("/user/me", headers=headers)
+    assert principal_cache.get(user.id, token).name == "Оновлене ім'я"
+
+
+def test_apple_relink_invalidates_cached_principal(client, user, monkeypatch):
+    token, headers = _auth(user)
+    client.get("/user/me", headers=headers)
+    assert principal_cache.get(user.id, token).auth_provider == "email"
+
+    monkeypatch.setattr(routes_apple, "verify_apple_identity_token",
+                        lambda identity_token: {"sub": f"apple-{user.id}", "email": user.email})
+    assert client.post("/auth/apple", json={"identity_token": "token"}).status_code == 200
+    assert principal_cache.get(user.id, token) is None
+    client.get("/user/me", headers=headers)
+    assert principal_cache.get(user.id, token).auth_provider == "apple"
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import pytest
+import requests
+from app.tasks import registry_fetch
+from app.tasks.registry_fetch import RegistryFetcher
+from app.tasks.registry_standin import serve_registry
+
+ARCHIVE_SIZE = 64 * 1024
+
+
+class RecordingSession(requests.Session):
+    # Записує заголовки запитів і може обірвати завантаження після fail_after байт
+    def __init__(self, fail_after=None):
+        super().__init__()
+        self.fail_after = fail_after
+        self.sent_headers = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent_headers.append(dict(headers or {}))
+        response = super().get(url, headers=headers, **kwargs)
+        if self.fail_after is not None:
+            iter_content, limit = response.iter_content, self.fail_after
+
+            def interrupted(chunk_size=1, **options):
+                received = 0
+                for chunk in iter_content(chunk_size=chunk_size, **options):
+                    if received >= limit:
+                        raise requests.ConnectionError("з'єднання обірвано")
+                    received += len(chunk)
+                    yield chunk
+
+            response.iter_content = interrupted
+        return response
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(registry_fetch, "CHUNK_SIZE", 4096)
+
+
+def _write_archive(path, seed, mtime_ns):
+    path.write_bytes(hashlib.sha256(seed).digest() * (ARCHIVE_SIZE // 32))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path.read_bytes()
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "reestrtz.zip"
+    _write_archive(path, b"first", 1_700_000_000_000_000_000)
+    return path
+
+
+def _fetcher(tmp_path, session, **kwargs):
+    return RegistryFetcher("", state_dir=str(tmp_path / "state"), session=session, **kwargs)
+
+
+def _fetch(fetcher, url, **kwargs):
+    fetcher.url = url
+    return fetcher.fetch(**kwargs)
+
+
+def test_not_modified_skips_download(tmp_path, source):
+    session = RecordingSession()
+    fetcher = _fetcher(tmp_path, session)
+    with serve_registry(str(source)) as url:
+        assert _fetch(fetcher, url)
+        fetcher.mark_imported()
+        archive_mtime = os.stat(fetcher.archive_path).st_mtime_ns
+        assert not _fetch(fetcher, url)
+
+    assert "If-None-Match" in session.sent_headers[1]
+    assert os.stat(fetcher.archive_path).st_mtime_ns == archive_mtime
+    assert not os.path.exists(fetcher.part_path)
+
+
+def test_interrupted_download_resumes_with_range(tmp_path, source, capsys):
+    with serve_registry(str(source)) as url:
+        with pytest.raises(requests.ConnectionError):
+            _fetch(_fetcher(tmp_path, RecordingSession(fail_after=ARCHIVE_SIZE // 2)), url)
+        fetcher = _fetcher(tmp_path, RecordingSession())
+        offset = os.path.getsize(fetcher.part_path)
+        assert 0 < offset < ARCHIVE_SIZE
+        capsys.readouterr()
+        assert _fetch(fetcher, url)
+
+    assert f"Продовження завантаження з {offset} байт" in capsys.readouterr().out
+
+    headers = fetcher.session.sent_headers[0]
+    assert headers["Range"] == f"bytes={offset}-"
+    assert headers["If-Range"] == fetcher.load_state()["etag"]
+    with open(fetcher.archive_path, "rb") as f:
+        assert f.read() == source.read_bytes()
+    assert fetcher.load_state()["sha256"] == hashlib.sha256(source.read_bytes()).hexdigest()
+
+
+def test_changed_etag_restarts_download(tmp_path, source, capsys):
+    with serve_registry(str(source)) as url:
+        with pytest.raises(requests.ConnectionError):
+            _fetch(_fetcher(tmp_path, RecordingSession(fail_after=ARCHIVE_SIZE // 2)), url)
+    # Поки завантаження стояло, на сервері з'явилася нова версія архіву
+    updated = _write_archive(source, b"second", 1_700_000_100_000_000_000)
+
+    fetcher = _fetcher(tmp_path, RecordingSession())
+    capsys.readouterr()
+    with serve_registry(str(source)) as url:
+        assert _fetch(fetcher, url)
+
+    assert "If-Range" in fetcher.session.sent_headers[0]
+    assert "Продовження" not in capsys.readouterr().out
+    with open(fetcher.archive_path, "rb") as f:
+        assert f.read() == updated
+
+
+def test_checksum_mismatch_does_not_commit_state(tmp_path, source):
+    fetcher = _fetcher(tmp_path, RecordingSession(), expected_sha256="0" * 64)
+    with serve_registry(str(source)) as url:
+        with pytest.raises(Exception, match="Контрольна сума"):
+            _fetch(fetcher, url)
+
+    with open(fetcher.state_path) as f:
+        state = json.load(f)
+    assert "sha256" not in state
+    assert not os.path.exists(fetcher.archive_path)
+    assert not os.path.exists(fetcher.part_path)